@@ -0,0 +1,245 @@
+"""Local benchmarks for the ingest and report paths.
+
+Run with `flask --app benchmarks <command>`. Each benchmark swaps the Claude
+client, Mongo collections or newsdata.io URL of `main` for local stand-ins
+only for its own duration, so nothing here ships in the serving app.
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import click
+from flask import render_template
+
+import main
+from main import app
+
+
+# --- benchmark-classify ---
+
+class _StubMessages:
+    """Stands in for client.messages with a fixed per-call latency.
+
+    Every `yes_every`-th benchmark article is an issue, so both the gate and
+    the enrichment tier do real work.
+    """
+
+    def __init__(self, latency, yes_every):
+        self.latency = latency
+        self.yes_every = max(1, yes_every)
+
+    def is_issue(self, number):
+        return number % self.yes_every == 0
+
+    def verdict(self, number, gate):
+        if number is None or not self.is_issue(number):
+            return {"is_issue": "NO"}
+        if gate:
+            return {"is_issue": "YES"}
+        return {
+            "is_issue": "YES",
+            "headline": f"Benchmark article {number}",
+            "description": "",
+            "headline_ai": "Benchmark issue",
+            "reason_html": "<b>Location</b>: Vijayawada",
+            "description_ai": "Sample summary.",
+            "content": "Sample summary.",
+            "department": "Home",
+        }
+
+    def create(self, **kwargs):
+        time.sleep(self.latency)
+        prompt = kwargs["messages"][0]["content"]
+        gate = kwargs["model"] == main.CLAUDE_GATE_MODEL
+        numbers = [int(n) for n in re.findall(r"Benchmark article (\d+)", prompt)]
+        if "### Article " in prompt:
+            text = json.dumps([
+                {"index": i + 1, **self.verdict(number, gate)} for i, number in enumerate(numbers)
+            ])
+        else:
+            text = json.dumps(self.verdict(numbers[0] if numbers else None, gate))
+        usage = type("Usage", (), {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4})()
+        block = type("Block", (), {"text": text})()
+        return type("Response", (), {"content": [block], "usage": usage})()
+
+
+@app.cli.command("benchmark-classify")
+@click.option("--articles", default=20, show_default=True, help="Number of synthetic articles.")
+@click.option("--latency", default=1.0, show_default=True, help="Simulated Claude latency in seconds.")
+@click.option("--legacy-delay", default=3.0, show_default=True, help="Fixed sleep per call in the old loop.")
+@click.option("--rate", default=main.CLAUDE_RATE_PER_SEC, show_default=True, help="Token-bucket rate for the new path.")
+@click.option("--yes-every", default=4, show_default=True, help="Every Nth article is an issue.")
+def benchmark_classify(articles, latency, legacy_delay, rate, yes_every):
+    """Compares sequential vs. pooled, tiered classification against a stubbed Anthropic client."""
+    sample = [
+        {"article_id": f"bench-{i}", "title": f"Benchmark article {i}", "description": "", "content": ""}
+        for i in range(articles)
+    ]
+    stub = type("StubClient", (), {"messages": _StubMessages(latency, yes_every)})()
+    with mock.patch.object(main, "client", stub):
+        with mock.patch.object(main, "claude_rate_limiter", main.TokenBucket(1e9, articles)):
+            start = time.perf_counter()
+            legacy = []
+            for article in sample:
+                legacy.append(main.check_if_issue(article))
+                time.sleep(legacy_delay)
+            sequential = time.perf_counter() - start
+
+        before = main.classification_metrics.snapshot()
+        with mock.patch.object(main, "claude_rate_limiter", main.TokenBucket(rate, main.CLAUDE_RATE_BURST)):
+            start = time.perf_counter()
+            pairs, _ = main.classify_articles(sample, use_cache=False)
+            pooled = time.perf_counter() - start
+        tiers = main.ClassificationMetrics.summarize(main.classification_metrics.snapshot(), before)
+
+    issues = [
+        sum(1 for v in verdicts if isinstance(v, dict) and v.get("is_issue") == "YES")
+        for verdicts in (legacy, [v for _, v in pairs])
+    ]
+    click.echo(
+        f"sequential: {sequential:.2f}s ({issues[0]} issues)  pooled: {pooled:.2f}s ({issues[1]} issues)  "
+        f"speedup: {sequential / pooled:.1f}x"
+    )
+    for tier, counters in tiers.items():
+        click.echo(f"  {tier}: {counters['calls']} calls, avg {counters['avg_latency_s']}s")
+
+
+# --- benchmark-pdf ---
+
+def process_tree_rss_mb():
+    """Resident memory of this process and its children (e.g. Chromium), Linux only."""
+    proc = Path("/proc")
+    if not proc.exists():
+        return None
+    parents = {}
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+            parents[int(stat.parent.name)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    tree, frontier = set(), {os.getpid()}
+    while frontier:
+        tree |= frontier
+        frontier = {pid for pid, ppid in parents.items() if ppid in frontier} - tree
+    total_kb = 0
+    for pid in tree:
+        try:
+            for line in (proc / str(pid) / "status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+@app.cli.command("benchmark-pdf")
+@click.option("--renders", default=5, show_default=True, help="Renders per backend.")
+def benchmark_pdf(renders):
+    """Compares latency and memory of the PDF backends on a sample report."""
+    categories = [
+        {
+            "category_name": f"Category {i}",
+            "issues": [f"Sample issue {j} reported in Vijayawada, NTR district." for j in range(6)],
+        }
+        for i in range(8)
+    ]
+    html = render_template("code.html", date=datetime.now().strftime("%d-%m-%Y"), categories=categories)
+
+    # WeasyPrint first, so Chromium processes don't inflate its memory figure.
+    for backend in ("weasyprint", "chromium"):
+        timings = []
+        try:
+            for _ in range(renders):
+                start = time.perf_counter()
+                main.render_pdf(html, backend=backend)
+                timings.append(time.perf_counter() - start)
+        except Exception as e:
+            click.echo(f"{backend}: failed ({e})")
+            continue
+        warm = timings[1:] or timings
+        rss = process_tree_rss_mb()
+        click.echo(
+            f"{backend}: first {timings[0]:.2f}s, warm mean {sum(warm) / len(warm):.2f}s, "
+            f"process tree RSS {f'{rss:.0f} MB' if rss is not None else 'n/a'}"
+        )
+
+
+# --- benchmark-fetch ---
+
+class _EmptyCollection:
+    """Stands in for feed_state/collection: no stored marks or articles."""
+
+    def find_one(self, *args, **kwargs):
+        return None
+
+
+def make_mock_feed_handler(pages, page_size, latency):
+    """HTTP handler serving canned newsdata.io pages after a fixed delay."""
+
+    class MockFeedHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            query = parse_qs(urlparse(self.path).query)
+            feed = query.get("prioritydomain", ["feed"])[0]
+            page = int(query.get("page", ["0"])[0])
+            now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            body = json.dumps({
+                "results": [
+                    {"article_id": f"{feed}-{page}-{i}", "title": f"{feed} page {page} article {i}",
+                     "pubDate": now, "source_priority": 100}
+                    for i in range(page_size)
+                ],
+                "nextPage": str(page + 1) if page + 1 < pages else None,
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return MockFeedHandler
+
+
+@app.cli.command("benchmark-fetch")
+@click.option("--feeds", default=len(main.NEWS_FEEDS), show_default=True, help="Number of priority feeds.")
+@click.option("--pages", default=3, show_default=True, help="nextPage hops served per feed.")
+@click.option("--latency", default=0.5, show_default=True, help="Simulated newsdata.io latency per page in seconds.")
+def benchmark_fetch(feeds, pages, latency):
+    """Compares sequential vs. parallel feed fetching against a local mock newsdata.io server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_mock_feed_handler(pages, 50, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    names = [f"bench{i}" for i in range(feeds)]
+    feed_url = f"http://127.0.0.1:{server.server_port}/news?apikey={{api_key}}&prioritydomain={{priority}}"
+
+    try:
+        with mock.patch.object(main, "NEWS_FEED_URL", feed_url), \
+                mock.patch.object(main, "feed_state", _EmptyCollection()), \
+                mock.patch.object(main, "collection", _EmptyCollection()):
+            start = time.perf_counter()
+            sequential_count = sum(len(page) for name in names for page in main.fetch_feed_pages(name, {}))
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            parallel_count = sum(len(batch) for batch in main.fetch_feed_batches(names, {}))
+            parallel = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    click.echo(
+        f"sequential: {sequential:.2f}s ({sequential_count} articles)  "
+        f"parallel: {parallel:.2f}s ({parallel_count} articles)  speedup: {sequential / parallel:.1f}x"
+    )
@@ -44,6 +44,10 @@ client_together = Together(api_key=TOGETHER_API_KEY)
 
 # --- Constants ---
 MAX_CONTENT_LENGTH = 1000
+NEWS_HTTP_TIMEOUT = (5, 30)
+
+# Shared keep-alive session so repeated newsdata.io calls reuse connections.
+http_session = requests.Session()
 
 # --- Flask Extensions ---
 bcrypt = Bcrypt(app)
@@ -124,13 +128,13 @@ def top():
 
     # Fetch top 10% domains
     url_top = f"https://newsdata.io/api/1/news?apikey={API_KEY}&country=in&q=Andhra%20Pradesh&size=50&removeduplicate=1&prioritydomain=top"
-    resp_top = requests.get(url_top)
+    resp_top = http_session.get(url_top, timeout=NEWS_HTTP_TIMEOUT)
     resp_top.raise_for_status()
     articles_top = resp_top.json().get("results", [])
 
     # Fetch top 30% (medium, includes top again — we'll deduplicate)
     url_medium = f"https://newsdata.io/api/1/news?apikey={API_KEY}&country=in&q=Andhra%20Pradesh&size=50&removeduplicate=1&prioritydomain=medium"
-    resp_medium = requests.get(url_medium)
+    resp_medium = http_session.get(url_medium, timeout=NEWS_HTTP_TIMEOUT)
     resp_medium.raise_for_status()
     articles_medium = resp_medium.json().get("results", [])
 
@@ -151,7 +155,7 @@ def fetch_and_store_news_logic():
     stored_count = 0
     
     try:
-        resp = requests.get(url)
+        resp = http_session.get(url, timeout=NEWS_HTTP_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         articles = data.get("results", [])
@@ -0,0 +1,48 @@
+"""gunicorn settings: gunicorn -c gunicorn.conf.py
+
+Threaded workers keep slow requests (Claude summaries, PDF rendering, SSE
+streams) from starving quick ones like /is-authenticated. The ingest
+scheduler is started once by the master as a separate process, never inside
+the workers.
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+wsgi_app = "wsgi:app"
+chdir = BASE_DIR
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = "gthread"
+# Every open dashboard tab holds one thread via /live-articles (for up to
+# LIVE_MAX_STREAM_SECONDS per connection), so workers * threads must cover the
+# expected open tabs plus headroom for ordinary requests.
+threads = int(os.getenv("WEB_THREADS", "16"))
+# Summaries and PDF renders can take tens of seconds.
+timeout = int(os.getenv("WEB_TIMEOUT", "180"))
+graceful_timeout = 30
+keepalive = 5
+
+_scheduler_process = None
+
+
+def when_ready(server):
+    global _scheduler_process
+    if os.getenv("START_SCHEDULER", "1") != "1":
+        return
+    _scheduler_process = subprocess.Popen(
+        [sys.executable, os.path.join(BASE_DIR, "main.py"), "--scheduler-only"], cwd=BASE_DIR
+    )
+    server.log.info("Started ingest scheduler (pid %s)", _scheduler_process.pid)
+
+
+def on_exit(server):
+    if _scheduler_process and _scheduler_process.poll() is None:
+        _scheduler_process.terminate()
+        try:
+            _scheduler_process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            _scheduler_process.kill()
@@ -1,5 +1,8 @@
-from flask import Flask, jsonify, send_file, render_template, request
+from flask import Flask, jsonify, send_file, render_template, request, Response, stream_with_context, make_response
+from functools import wraps
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -8,18 +11,32 @@ import os
 from flask_cors import CORS
 import pdfkit
 import google.generativeai
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from pymongo import ReturnDocument
+from bson import ObjectId
 from deep_translator import GoogleTranslator
 from langdetect import detect
 import json
+import hashlib
+import tempfile
+import math
+import random
+import base64
 from apscheduler.schedulers.background import BackgroundScheduler
 import atexit
+import argparse
+import click
 import time
 from io import BytesIO
 from flask_bcrypt import Bcrypt
 import jwt
 from dotenv import load_dotenv
-from difflib import SequenceMatcher
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+import queue
+import socket
+import uuid
 
 import anthropic
 
@@ -49,6 +66,178 @@ client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
 
 # --- Constants ---
 MAX_CONTENT_LENGTH = 1000
+CLAUDE_MODEL = "claude-3-5-sonnet-20240620"
+
+DEPARTMENTS = (
+    "Agriculture And Co-operation, Animal Husbandry, Dairy Development and Fisheries, AP NRTS, APPSC, Backward Classes Welfare, Chief Minister's relief fund (CMRF), Consumer Affairs, Food and Civil Supplies, Corona, Department of Economically Weaker Sections Welfare, Department of Skills Development and Training, Disaster Management, Energy, Environment, Forest, Science And Technology, Finance, General Administration, Grama Volunteers/Ward Volunteers And Village Secretariats/Ward Secretariats, Health, Medical And Family Welfare, Home, Housing, Human Resources (Higher Education), Human Resources (School Education), Industries and Commerce, Information Technology, Electronics and Communications, Infrastructure And Investments, Labour, Factories, Boilers And Insurance Medical Services, Law, Minorities Welfare, Municipal Administration And Urban Development, Panchayat Raj And Rural Development, Planning, Public Enterprises, Revenue, Social Welfare, Transport, Roads and Buildings, Tribal Welfare, Water Resources, Women, Children, Disabled and Senior Citizens, Youth Advancement, Tourism And Culture."
+)
+
+# Classification throughput: number of concurrent Claude calls and the
+# token-bucket limits (sustained requests/second and burst size) shared by them.
+CLASSIFY_CONCURRENCY = int(os.getenv("CLASSIFY_CONCURRENCY", "5"))
+CLAUDE_RATE_PER_SEC = float(os.getenv("CLAUDE_RATE_PER_SEC", "1"))
+CLAUDE_RATE_BURST = int(os.getenv("CLAUDE_RATE_BURST", "5"))
+# Articles packed into one classification request (1 disables batching).
+CLASSIFY_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", "5"))
+# Two-tier classification: a small model answers only is_issue, and the full
+# enrichment prompt (translation, summaries, department) runs for YES articles.
+# Output budgets are per article, sized to each tier's JSON schema.
+CLASSIFY_TIERED = os.getenv("CLASSIFY_TIERED", "1") == "1"
+CLAUDE_GATE_MODEL = os.getenv("CLAUDE_GATE_MODEL", "claude-3-haiku-20240307")
+GATE_MAX_TOKENS_PER_ARTICLE = int(os.getenv("GATE_MAX_TOKENS_PER_ARTICLE", "20"))
+ENRICH_MAX_TOKENS_PER_ARTICLE = int(os.getenv("ENRICH_MAX_TOKENS_PER_ARTICLE", "1200"))
+GATE_DESCRIPTION_LENGTH = 300
+# Near-duplicate headline detection: MinHash over normalized headline words,
+# 16 LSH bands of 4 rows, compared only with articles published in the last
+# NEAR_DUPLICATE_WINDOW_HOURS. Headlines with Jaccard similarity of at least
+# NEAR_DUPLICATE_MIN_JACCARD are re-posts (at 0.7 a pair shares a band ~99% of
+# the time; candidates are confirmed on the exact word sets). Headlines shorter
+# than NEAR_DUPLICATE_SHORT_WORDS words need NEAR_DUPLICATE_SHORT_MIN_JACCARD,
+# so one swapped word ("Man" vs "Woman killed...") is a different story, and
+# headlines under NEAR_DUPLICATE_MIN_WORDS words are never fuzzy-matched.
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+NEAR_DUPLICATE_WINDOW_HOURS = int(os.getenv("NEAR_DUPLICATE_WINDOW_HOURS", "72"))
+NEAR_DUPLICATE_MIN_JACCARD = float(os.getenv("NEAR_DUPLICATE_MIN_JACCARD", "0.7"))
+NEAR_DUPLICATE_SHORT_WORDS = 10
+NEAR_DUPLICATE_SHORT_MIN_JACCARD = float(os.getenv("NEAR_DUPLICATE_SHORT_MIN_JACCARD", "0.85"))
+NEAR_DUPLICATE_MIN_WORDS = 4
+# Words that carry no signal in an Andhra Pradesh feed, and spelled-out numbers
+# folded to digits so "Five killed" and "5 killed" compare equal.
+HEADLINE_STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "at", "to", "for", "from", "by", "with", "and", "or",
+    "is", "are", "was", "were", "be", "as", "its", "it", "after", "over", "amid",
+    "andhra", "pradesh", "ap",
+}
+HEADLINE_NUMBER_WORDS = {
+    word: str(number) for number, word in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen "
+        "fifteen sixteen seventeen eighteen nineteen twenty".split()
+    )
+}
+# newsdata.io HTTP client: (connect, read) timeouts in seconds, retry budget and
+# base backoff for transient failures. Retries back off exponentially with jitter.
+NEWS_HTTP_TIMEOUT = (float(os.getenv("NEWS_HTTP_CONNECT_TIMEOUT", "5")), float(os.getenv("NEWS_HTTP_READ_TIMEOUT", "30")))
+NEWS_HTTP_RETRIES = int(os.getenv("NEWS_HTTP_RETRIES", "3"))
+NEWS_HTTP_BACKOFF = float(os.getenv("NEWS_HTTP_BACKOFF", "0.5"))
+# newsdata.io feeds (one per priority domain) and the most nextPage hops
+# followed per feed in one run when no stored article is reached first.
+NEWS_FEED_URL = "https://newsdata.io/api/1/news?apikey={api_key}&country=in&q=Andhra%20Pradesh&size=50&removeduplicate=1&prioritydomain={priority}"
+NEWS_FEEDS = ["top", "medium"]
+NEWS_MAX_PAGES = int(os.getenv("NEWS_MAX_PAGES", "5"))
+# newsdata.io can index an article well after its pubDate, so paging only stops
+# once a page reaches this far below the persisted high-water mark.
+NEWS_HWM_GRACE_SECONDS = int(os.getenv("NEWS_HWM_GRACE_SECONDS", "3600"))
+# Adaptive ingest polling: the interval halves (down to the minimum) while new
+# articles keep arriving and doubles (up to the maximum) when feeds are quiet.
+# The run lock expires after INGEST_LOCK_TTL seconds in case a holder dies.
+INGEST_MIN_INTERVAL = int(os.getenv("INGEST_MIN_INTERVAL", "120"))
+INGEST_MAX_INTERVAL = int(os.getenv("INGEST_MAX_INTERVAL", "3600"))
+INGEST_LOCK_TTL = int(os.getenv("INGEST_LOCK_TTL", "1800"))
+# /live-articles: keep-alive period (also the change-stream wait) and the
+# polling period used when the deployment has no change streams.
+LIVE_HEARTBEAT_SECONDS = int(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", "2"))
+# Each open stream holds a gunicorn worker thread; streams end after this long
+# and EventSource reconnects, resuming from Last-Event-ID.
+LIVE_MAX_STREAM_SECONDS = int(os.getenv("LIVE_MAX_STREAM_SECONDS", "300"))
+# Read endpoints answer If-None-Match from per-date collection versions; clients
+# must revalidate every time, which costs one small versions lookup.
+READ_CACHE_CONTROL = os.getenv("READ_CACHE_CONTROL", "private, no-cache")
+# Ingest pipeline: max batches waiting between two stages before the upstream
+# stage blocks (backpressure).
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+# Accepted articles are buffered and written in one bulk upsert once this many
+# are pending or this many seconds have passed since the last write.
+INSERT_BATCH_SIZE = int(os.getenv("INSERT_BATCH_SIZE", "20"))
+INSERT_FLUSH_INTERVAL = float(os.getenv("INSERT_FLUSH_INTERVAL", "10"))
+# /search-articles page size (default and upper bound) and text index weights.
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "100"))
+SEARCH_MAX_PAGE_SIZE = 500
+SEARCH_FIELD_WEIGHTS = {
+    "headline": 10,
+    "headline_ai": 10,
+    "keywords": 5,
+    "tags": 5,
+    "description": 3,
+    "description_ai": 3,
+    "issue_reason": 2,
+    "content": 1,
+}
+# Word-prefix fallback used when the text index finds nothing (e.g. a partly
+# typed word): every 2..SEARCH_PREFIX_MAX_LENGTH character prefix of each word
+# in these fields is stored, indexed, in the article's search_prefixes array.
+SEARCH_PREFIX_FIELDS = ["headline", "headline_ai"]
+SEARCH_PREFIX_MIN_LENGTH = 2
+SEARCH_PREFIX_MAX_LENGTH = 12
+# Local pre-filter in front of Claude: articles it scores as a reject with at
+# least PREFILTER_THRESHOLD probability skip the LLM; PREFILTER_AUDIT_RATE of
+# those are still sent to Claude to measure its precision and recall. It is
+# trained on up to PREFILTER_TRAINING_LIMIT logged Claude accepts and rejects
+# per class (raw source text, kept PREFILTER_SAMPLE_TTL_DAYS) and stays off
+# until each class has PREFILTER_MIN_SAMPLES examples.
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "1") == "1"
+PREFILTER_THRESHOLD = float(os.getenv("PREFILTER_THRESHOLD", "0.97"))
+PREFILTER_AUDIT_RATE = float(os.getenv("PREFILTER_AUDIT_RATE", "0.1"))
+PREFILTER_TRAINING_LIMIT = int(os.getenv("PREFILTER_TRAINING_LIMIT", "2000"))
+PREFILTER_MIN_SAMPLES = int(os.getenv("PREFILTER_MIN_SAMPLES", "50"))
+PREFILTER_SAMPLE_TTL_DAYS = int(os.getenv("PREFILTER_SAMPLE_TTL_DAYS", "180"))
+TELANGANA_TERMS = ("telangana", "hyderabad", "secunderabad", "warangal", "karimnagar", "khammam", "nizamabad")
+ANDHRA_TERMS = (
+    "andhra", "amaravati", "vijayawada", "visakhapatnam", "vizag", "guntur", "tirupati", "nellore",
+    "kurnool", "kadapa", "anantapur", "rajahmundry", "kakinada", "srikakulam", "ongole", "eluru",
+    "chittoor", "vizianagaram",
+)
+# How long a cached Claude verdict for an article's content is reused.
+CLASSIFICATION_CACHE_TTL_DAYS = int(os.getenv("CLASSIFICATION_CACHE_TTL_DAYS", "30"))
+
+# Summaries are cached per article-set fingerprint; entries idle for the TTL
+# expire and the least recently used are evicted past the entry cap.
+SUMMARY_CACHE_TTL_HOURS = int(os.getenv("SUMMARY_CACHE_TTL_HOURS", "168"))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "200"))
+# Days with more articles than this are summarized per department in parallel
+# (at most SUMMARY_MAP_CONCURRENCY at once) and merged.
+SUMMARY_MAP_REDUCE_THRESHOLD = int(os.getenv("SUMMARY_MAP_REDUCE_THRESHOLD", "40"))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+# A single-day summary is updated by folding in only the new articles, unless
+# more than this many arrived since the last update (then it is rebuilt).
+INCREMENTAL_SUMMARY_MAX_DELTA = int(os.getenv("INCREMENTAL_SUMMARY_MAX_DELTA", "30"))
+
+# Warm Chromium pool used for PDF rendering: browser workers, renders before a
+# browser is recycled, pending-job limit and per-render timeout (seconds).
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+PDF_RECYCLE_AFTER = int(os.getenv("PDF_RECYCLE_AFTER", "50"))
+PDF_QUEUE_SIZE = int(os.getenv("PDF_QUEUE_SIZE", "20"))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+# PDF engine: "chromium" (headless browser pool) or "weasyprint" (pure Python).
+PDF_BACKEND = os.getenv("PDF_BACKEND", "chromium").lower()
+FONT_PATH = Path(__file__).resolve().parent / "DejaVuSans.ttf"
+
+# Materialized daily reports (summary JSON, HTML, PDF) are stored here under
+# their sha256, with per-date metadata in the report_artifacts collection.
+# Files of a superseded build are deleted once no date references them.
+REPORTS_DIR = Path(os.getenv("REPORTS_DIR", Path(__file__).resolve().parent / "reports"))
+
+# --- HTTP Client ---
+
+def build_http_session():
+    """Keep-alive session with pooled connections and jittered retries for GETs."""
+    retry = Retry(
+        total=NEWS_HTTP_RETRIES,
+        backoff_factor=NEWS_HTTP_BACKOFF,
+        backoff_jitter=NEWS_HTTP_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+http_session = build_http_session()
 
 # --- Flask Extensions ---
 bcrypt = Bcrypt(app)
@@ -58,6 +247,50 @@ client2 = MongoClient(os.getenv("MONGO_URI"))
 db = client2["news_db"]
 collection = db["andhra_pradesh_news"]
 users_collection = db["users"]
+classification_cache = db["classification_cache"]
+summary_cache = db["summary_cache"]
+report_artifacts = db["report_artifacts"]
+feed_state = db["feed_state"]
+locks = db["locks"]
+scheduler_state = db["scheduler_state"]
+collection_versions = db["collection_versions"]
+summary_state = db["summary_state"]
+prefilter_samples = db["prefilter_samples"]
+
+
+def ensure_indexes():
+    """Creates the indexes the app relies on. Safe to call on every startup.
+
+    Each index is built on its own, so one failure (e.g. the unique article_id
+    index on a collection that still holds duplicates) doesn't skip the rest.
+    """
+    indexes = [
+        (collection, "article_id", {
+            "unique": True, "partialFilterExpression": {"article_id": {"$type": "string"}},
+        }),
+        (collection, "headline", {}),
+        (collection, "url", {}),
+        (collection, [("title_minhash_bands", 1), ("published_date", -1)], {}),
+        (collection, [("published_date", -1), ("department", 1)], {}),
+        (collection, [("published_date", -1), ("_id", -1)], {}),
+        (collection, [("search_prefixes", 1), ("published_date", -1), ("_id", -1)], {}),
+        (collection, [(field, "text") for field in SEARCH_FIELD_WEIGHTS], {
+            "weights": SEARCH_FIELD_WEIGHTS, "name": "article_text_search",
+        }),
+        (classification_cache, "created_at", {"expireAfterSeconds": CLASSIFICATION_CACHE_TTL_DAYS * 24 * 3600}),
+        (prefilter_samples, "created_at", {"expireAfterSeconds": PREFILTER_SAMPLE_TTL_DAYS * 24 * 3600}),
+        (prefilter_samples, [("label", 1), ("_id", -1)], {}),
+        (summary_cache, "dates", {}),
+        (summary_cache, "last_used_at", {"expireAfterSeconds": SUMMARY_CACHE_TTL_HOURS * 3600}),
+    ]
+    for target, keys, options in indexes:
+        try:
+            target.create_index(keys, **options)
+        except Exception as e:
+            print(f"[Startup] Index {keys!r} on {target.name} failed: {e}")
+            if getattr(e, "code", None) == 11000:
+                print("[Startup] Remove duplicates with 'flask --app main dedupe-articles', then restart.")
+
 
 # --- Helper Functions ---
 
@@ -70,12 +303,63 @@ def clean_text(text):
     text = re.sub(r"\s+", " ", text)
     return text.strip()
 
+def parse_pub_date(value):
+    """Parses a newsdata.io pubDate (UTC) into an aware datetime, or None."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value:
+        return None
+    text = clean_text(str(value))
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    try:
+        parsed = datetime.fromisoformat(text)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def format_pub_date(value, time_format="%Y-%m-%d %H:%M:%S"):
+    """Formats a stored published_date the way the API has always returned it."""
+    if isinstance(value, datetime):
+        return value.strftime(time_format)
+    return value
+
 def is_not_english(text):
     try:
         return detect(text) != "en"
     except:
         return False
 
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace calls to an external API."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+claude_rate_limiter = TokenBucket(CLAUDE_RATE_PER_SEC, CLAUDE_RATE_BURST)
+
 # def safe_translate(text, retries=3):
 #     for attempt in range(retries):
 #         try:
@@ -142,6 +426,23 @@ def is_not_english(text):
 #     return prompt.strip()
 
 
+def clean_for_prompt(text):
+    return ''.join(c for c in text if c.isprintable()).strip()
+
+
+def format_article_for_prompt(article):
+    title = clean_for_prompt(article.get("title") or "")
+    desc = clean_for_prompt(article.get("description") or "")
+    content = clean_for_prompt(article.get("content") or "")
+    keywords = article.get("keywords") or []
+
+    return f"""Original Headline: {title}
+Description: {desc}
+Content: {content[:MAX_CONTENT_LENGTH]}
+Keywords: {keywords}"""
+
+
+
 def build_issue_check_prompt(article):
     prompt = """
 You are a governance and public policy AI expert.
@@ -182,7 +483,7 @@ Your responsibilities:
   "department": "<Select the best-fit department from the list below>"
 }
 Available Departments:
-Agriculture And Co-operation, Animal Husbandry, Dairy Development and Fisheries, AP NRTS, APPSC, Backward Classes Welfare, Chief Minister's relief fund (CMRF), Consumer Affairs, Food and Civil Supplies, Corona, Department of Economically Weaker Sections Welfare, Department of Skills Development and Training, Disaster Management, Energy, Environment, Forest, Science And Technology, Finance, General Administration, Grama Volunteers/Ward Volunteers And Village Secretariats/Ward Secretariats, Health, Medical And Family Welfare, Home, Housing, Human Resources (Higher Education), Human Resources (School Education), Industries and Commerce, Information Technology, Electronics and Communications, Infrastructure And Investments, Labour, Factories, Boilers And Insurance Medical Services, Law, Minorities Welfare, Municipal Administration And Urban Development, Panchayat Raj And Rural Development, Planning, Public Enterprises, Revenue, Social Welfare, Transport, Roads and Buildings, Tribal Welfare, Water Resources, Women, Children, Disabled and Senior Citizens, Youth Advancement, Tourism And Culture.
+""" + DEPARTMENTS + """
 Instructions:
 Detect and translate headline or description if in Telugu.
 Translate and summarize description and content in fluent English.
@@ -191,42 +492,209 @@ Match the core issue with the most related department.
 ⚠️ Output must be only valid JSON — no markdown, explanation, or formatting outside the JSON.
 """
 
-    def clean_for_prompt(text):
-        return ''.join(c for c in text if c.isprintable()).strip()
+    prompt += "\n\n" + format_article_for_prompt(article)
+    return prompt.strip()
 
-    title = clean_for_prompt(article.get("title", ""))
-    desc = clean_for_prompt(article.get("description") or "")
-    content = clean_for_prompt(article.get("content") or "")
-    keywords = article.get("keywords") or []
 
-    prompt += f"""
+def build_batch_issue_check_prompt(articles):
+    """Builds one prompt that classifies several articles, sharing the instructions."""
+    prompt = """
+You are a governance and public policy AI expert.
+
+You will be given several numbered news articles from Andhra Pradesh or nearby regions.
 
-Original Headline: {title}
-Description: {desc}
-Content: {content[:1000]}
-Keywords: {keywords}
+For EACH article:
+1. Determine whether it discusses a **major negative issue** such as:
+   - Public problems, governance failures, crime, unrest, corruption, disasters, or any serious public concern.
+
+2. ⛔ Strictly EXCLUDE:
+   - Telangana-related news
+   - Any political coverage (election campaigns, party statements, leader speeches, political promotion)
+
+3. ✅ Only include stories impacting the **general public negatively** and **located in Andhra Pradesh**.
+
+4. If it is an issue, classify it into **one appropriate government department** from the list below.
+
+---
+
+Return a JSON array with exactly one object per article, in the same order as the input.
+For an article that is NOT a public issue or is about Telangana/politics:
+{"index": <article number>, "is_issue": "NO"}
+For an article that IS a public issue:
+{
+  "index": <article number>,
+  "headline": "<Original headline in English (translate if in Telugu)>",
+  "description": "<Original description in English (translate if in Telugu)>",
+  "headline_ai": "<5–6 word summary>",
+  "is_issue": "YES",
+  "reason_html": "<3-line HTML explanation with <b>Location</b>>",
+  "description_ai": "<2-paragraph English summary>",
+  "content": "<2-paragraph English summary>",
+  "department": "<Select the best-fit department from the list below>"
+}
+Available Departments:
+""" + DEPARTMENTS + """
+Instructions:
+Detect and translate headline or description if in Telugu.
+Translate and summarize description and content in fluent English.
+Match the core issue with the most related department.
+
+⚠️ Output must be only a valid JSON array — no markdown, explanation, or formatting outside the array.
 """
+
+    for number, article in enumerate(articles, start=1):
+        prompt += f"\n\n### Article {number}\n" + format_article_for_prompt(article)
     return prompt.strip()
 
 
-def check_if_issue(article):
-    prompt = build_issue_check_prompt(article)
-    print("Prompt length:", len(prompt))
+def build_batch_gate_prompt(articles):
+    """Short yes/no prompt for the gate tier: headline, trimmed description, keywords."""
+    prompt = """
+For each numbered news article, answer whether it reports a major negative public issue
+(public problems, governance failures, crime, unrest, corruption, disasters) located in
+Andhra Pradesh. Answer NO for Telangana news and for political coverage (campaigns, party
+statements, leader speeches).
+
+Return only a JSON array with one object per article, in input order:
+[{"index": <article number>, "is_issue": "YES" or "NO"}]
+"""
+    for number, article in enumerate(articles, start=1):
+        title = clean_for_prompt(article.get("title") or "")
+        desc = clean_for_prompt(article.get("description") or "")[:GATE_DESCRIPTION_LENGTH]
+        keywords = article.get("keywords") or []
+        prompt += f"\n### Article {number}\nHeadline: {title}\nDescription: {desc}\nKeywords: {keywords}\n"
+    return prompt.strip()
+
+
+class ClassificationMetrics:
+    """Per-tier counters for Claude classification calls (thread-safe).
+
+    Counts calls, failures, wall-clock latency and input/output tokens taken
+    from response.usage, keyed by tier ("gate" or "enrich").
+    """
+
+    FIELDS = ("calls", "failures", "latency_s", "input_tokens", "output_tokens")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tiers = {}
+
+    def record(self, tier, latency, response=None, failed=False):
+        usage = getattr(response, "usage", None)
+        with self.lock:
+            counters = self.tiers.setdefault(tier, dict.fromkeys(self.FIELDS, 0))
+            counters["calls"] += 1
+            counters["failures"] += int(failed)
+            counters["latency_s"] += latency
+            counters["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+            counters["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+
+    def snapshot(self):
+        with self.lock:
+            return {tier: dict(counters) for tier, counters in self.tiers.items()}
+
+    @classmethod
+    def summarize(cls, after, before=None):
+        """Rounded per-tier totals (and average latency) of `after` minus `before`."""
+        before = before or {}
+        report = {}
+        for tier, counters in after.items():
+            base = before.get(tier, {})
+            delta = {field: counters[field] - base.get(field, 0) for field in cls.FIELDS}
+            if not delta["calls"]:
+                continue
+            delta["latency_s"] = round(delta["latency_s"], 2)
+            delta["avg_latency_s"] = round(delta["latency_s"] / delta["calls"], 3)
+            report[tier] = delta
+        return report
+
+
+classification_metrics = ClassificationMetrics()
+
+
+def call_claude(tier, model, prompt, max_tokens):
+    """One rate-limited Claude call, timed and counted under `tier`.
+
+    Returns the printable response text, or None on failure or empty content.
+    """
+    claude_rate_limiter.acquire()
+    start = time.perf_counter()
     try:
         response = client.messages.create(
-            model="claude-3-5-sonnet-20240620",
-            max_tokens= 8000, 
+            model=model,
+            max_tokens=max_tokens,
             temperature=0.3,
             messages=[{"role": "user", "content": prompt}]
         )
-        time.sleep(3)
+    except Exception as e:
+        classification_metrics.record(tier, time.perf_counter() - start, failed=True)
+        print(f"❌ Claude {tier} request failed:", e)
+        return None
 
-        if not response or not getattr(response, "content", None):
-            print("❌ Claude returned empty content.")
+    empty = not response or not getattr(response, "content", None)
+    classification_metrics.record(tier, time.perf_counter() - start, response, failed=empty)
+    if empty:
+        print(f"❌ Claude returned empty content ({tier}).")
+        return None
+    raw = response.content[0].text.strip()
+    return ''.join(c for c in raw if c.isprintable())
+
+
+def parse_batch_verdicts(clean_raw, count):
+    """Aligns a JSON array of {"index": n, ...} objects with `count` inputs.
+
+    Returns None if there is no JSON array; entries the model skipped are None.
+    """
+    match = re.search(r"\[.*\]", clean_raw, re.DOTALL)
+    if not match:
+        return None
+    parsed = json.loads(match.group(0))
+    if not isinstance(parsed, list):
+        return None
+
+    verdicts = [None] * count
+    for position, item in enumerate(parsed):
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("index", position + 1)
+        if isinstance(index, int) and 1 <= index <= count:
+            verdicts[index - 1] = item
+    return verdicts
+
+
+def gate_batch(articles):
+    """Asks the gate model whether each article is an issue.
+
+    Returns a list aligned with `articles` holding "YES", "NO" or None when
+    the gate gave no usable answer for that article.
+    """
+    clean_raw = call_claude(
+        "gate", CLAUDE_GATE_MODEL, build_batch_gate_prompt(articles),
+        GATE_MAX_TOKENS_PER_ARTICLE * len(articles) + 20,
+    )
+    try:
+        verdicts = parse_batch_verdicts(clean_raw, len(articles)) if clean_raw else None
+    except ValueError as e:
+        print("❌ Claude gate response was not valid JSON:", e)
+        verdicts = None
+    if verdicts is None:
+        return [None] * len(articles)
+
+    answers = []
+    for verdict in verdicts:
+        answer = str((verdict or {}).get("is_issue", "")).strip().upper()
+        answers.append(answer if answer in ("YES", "NO") else None)
+    return answers
+
+
+def check_if_issue(article):
+    prompt = build_issue_check_prompt(article)
+    print("Prompt length:", len(prompt))
+    try:
+        clean_raw = call_claude("enrich", CLAUDE_MODEL, prompt, ENRICH_MAX_TOKENS_PER_ARTICLE)
+        if clean_raw is None:
             return None
 
-        raw = response.content[0].text.strip()
-        clean_raw = ''.join(c for c in raw if c.isprintable())
         match = re.search(r"\{.*\}", clean_raw, re.DOTALL)
         if not match:
             print("❌ Claude response did not contain valid JSON object.")
@@ -241,26 +709,632 @@ def check_if_issue(article):
         return None
 
 
+def check_if_issue_batch(articles):
+    """Classifies several articles with one Claude call.
 
-def fetch_and_store_news_logic():
-    urls = [
-        f"https://newsdata.io/api/1/news?apikey={API_KEY}&country=in&q=Andhra%20Pradesh&size=50&removeduplicate=1&prioritydomain=top",
-        f"https://newsdata.io/api/1/news?apikey={API_KEY}&country=in&q=Andhra%20Pradesh&size=50&removeduplicate=1&prioritydomain=medium"
+    Returns a list of verdicts aligned with `articles`; an entry is None when
+    the model's answer for that article could not be parsed. Returns None if
+    the request fails or the response is not a JSON array.
+    """
+    prompt = build_batch_issue_check_prompt(articles)
+    print(f"Batch prompt length: {len(prompt)} ({len(articles)} articles)")
+    try:
+        clean_raw = call_claude(
+            "enrich", CLAUDE_MODEL, prompt, ENRICH_MAX_TOKENS_PER_ARTICLE * len(articles)
+        )
+        if clean_raw is None:
+            return None
+
+        verdicts = parse_batch_verdicts(clean_raw, len(articles))
+        if verdicts is None:
+            print("❌ Claude batch response did not contain a JSON array.")
+        return verdicts
+
+    except Exception as e:
+        print("❌ Claude batch request failed:", e)
+        return None
+
+
+def classify_batch(articles):
+    """Classifies a chunk of articles through the gate and enrichment tiers.
+
+    Articles the gate answers NO for are settled there; YES articles, and any
+    the gate could not answer, get the full enrichment prompt.
+    """
+    if not CLASSIFY_TIERED:
+        return enrich_batch(articles)
+
+    verdicts = [None] * len(articles)
+    to_enrich = []
+    for i, answer in enumerate(gate_batch(articles)):
+        if answer == "NO":
+            verdicts[i] = {"is_issue": "NO"}
+        else:
+            to_enrich.append(i)
+    if to_enrich:
+        enriched = enrich_batch([articles[i] for i in to_enrich])
+        for i, verdict in zip(to_enrich, enriched):
+            verdicts[i] = verdict
+    return verdicts
+
+
+def enrich_batch(articles):
+    """Runs the full classification prompt, falling back to single calls for gaps."""
+    verdicts = None
+    if len(articles) > 1:
+        verdicts = check_if_issue_batch(articles)
+    if verdicts is None:
+        verdicts = [None] * len(articles)
+
+    for i, article in enumerate(articles):
+        if verdicts[i] is None:
+            verdicts[i] = check_if_issue(article)
+    return verdicts
+
+
+def classification_cache_key(article):
+    """Hash of the article's normalized title, description and content."""
+    parts = [
+        clean_text(article.get(field) or "").lower()
+        for field in ("title", "description", "content")
     ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
 
-    stored_count = 0
-    seen_ids = set()
 
+def load_cached_verdicts(keys):
     try:
-        all_articles = []
-        existing_headlines = [
-            doc["headline"] for doc in collection.find({}, {"headline": 1}) if doc.get("headline")
+        docs = classification_cache.find({"_id": {"$in": list(set(keys))}}, {"verdict": 1})
+        return {doc["_id"]: doc["verdict"] for doc in docs}
+    except Exception as e:
+        print(f"[Classification cache] lookup failed: {e}")
+        return {}
+
+
+def store_cached_verdicts(entries):
+    operations = [
+        UpdateOne(
+            {"_id": key},
+            {"$set": {"verdict": verdict, "created_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        for key, verdict in entries
+        if isinstance(verdict, dict)
+    ]
+    if not operations:
+        return
+    try:
+        classification_cache.bulk_write(operations, ordered=False)
+    except Exception as e:
+        print(f"[Classification cache] write failed: {e}")
+
+
+def prefilter_text(article):
+    return " ".join([
+        article.get("title") or article.get("headline") or "",
+        article.get("description") or "",
+        " ".join(article.get("keywords") or []),
+    ]).lower()
+
+
+def prefilter_tokens(text):
+    return re.findall(r"[a-z]{3,}", text)
+
+
+class IssuePreFilter:
+    """Cheap local first pass that spots articles Claude would reject.
+
+    Combines a geography rule (Telangana places without any Andhra Pradesh
+    place) with a multinomial Naive Bayes model over title, description and
+    keywords, trained from Claude's logged accepts and rejects. Tracks how its
+    predictions compare with Claude's verdicts for the per-run report.
+    """
+
+    def __init__(self, accepted_texts, rejected_texts):
+        self.enabled = (
+            PREFILTER_ENABLED
+            and len(accepted_texts) >= PREFILTER_MIN_SAMPLES
+            and len(rejected_texts) >= PREFILTER_MIN_SAMPLES
+        )
+        self.counts = {"accept": {}, "reject": {}}
+        self.totals = {"accept": 0, "reject": 0}
+        self.docs = {"accept": len(accepted_texts), "reject": len(rejected_texts)}
+        for label, texts in (("accept", accepted_texts), ("reject", rejected_texts)):
+            for text in texts:
+                for token in prefilter_tokens(text.lower()):
+                    self.counts[label][token] = self.counts[label].get(token, 0) + 1
+                    self.totals[label] += 1
+        self.vocabulary = len(set(self.counts["accept"]) | set(self.counts["reject"])) or 1
+        self.stats = {
+            "flagged": 0, "skipped": 0, "audited": 0,
+            "flagged_rejected": 0, "flagged_accepted": 0, "unflagged_rejected": 0,
+        }
+
+    @classmethod
+    def from_history(cls):
+        if not PREFILTER_ENABLED:
+            return cls([], [])
+        try:
+            texts = {
+                label: [
+                    doc.get("text") or ""
+                    for doc in prefilter_samples.find({"label": label}, {"text": 1})
+                    .sort("_id", -1).limit(PREFILTER_TRAINING_LIMIT)
+                ]
+                for label in ("accept", "reject")
+            }
+            return cls(texts["accept"], texts["reject"])
+        except Exception as e:
+            print(f"[Prefilter] training failed, disabled for this run: {e}")
+            return cls([], [])
+
+    def reject_probability(self, article):
+        text = prefilter_text(article)
+        if any(term in text for term in TELANGANA_TERMS) and not any(term in text for term in ANDHRA_TERMS):
+            return 1.0
+
+        total_docs = self.docs["accept"] + self.docs["reject"]
+        scores = {}
+        for label in ("accept", "reject"):
+            score = math.log(self.docs[label] / total_docs)
+            denominator = self.totals[label] + self.vocabulary
+            for token in prefilter_tokens(text):
+                score += math.log((self.counts[label].get(token, 0) + 1) / denominator)
+            scores[label] = score
+        return 1 / (1 + math.exp(max(-700, min(700, scores["accept"] - scores["reject"]))))
+
+    def predicts_reject(self, article):
+        return self.enabled and self.reject_probability(article) >= PREFILTER_THRESHOLD
+
+    def record(self, flagged, verdict):
+        if not isinstance(verdict, dict):
+            return
+        rejected = verdict.get("is_issue") != "YES"
+        if flagged:
+            self.stats["flagged_rejected" if rejected else "flagged_accepted"] += 1
+        elif rejected:
+            self.stats["unflagged_rejected"] += 1
+
+    def report(self):
+        """Precision comes from the audited sample of flagged articles. For
+        recall, audited rejects are scaled up to every flagged article
+        (flagged / audited) before comparing with the rejects it missed.
+        """
+        s = self.stats
+        audited_verdicts = s["flagged_rejected"] + s["flagged_accepted"]
+        precision = recall = None
+        if audited_verdicts:
+            precision = s["flagged_rejected"] / audited_verdicts
+            caught = precision * s["flagged"]
+            if caught + s["unflagged_rejected"]:
+                recall = caught / (caught + s["unflagged_rejected"])
+        return {
+            "enabled": self.enabled,
+            "flagged": s["flagged"],
+            "llm_calls_saved": s["skipped"],
+            "audited": s["audited"],
+            "precision": round(precision, 3) if precision is not None else None,
+            "recall": round(recall, 3) if recall is not None else None,
+        }
+
+
+def log_prefilter_samples(pairs):
+    """Keeps Claude's verdicts, with the raw source text, as pre-filter training data."""
+    docs = [
+        {
+            "text": prefilter_text(article),
+            "label": "accept" if verdict.get("is_issue") == "YES" else "reject",
+            "created_at": datetime.now(timezone.utc),
+        }
+        for article, verdict in pairs
+        if isinstance(verdict, dict) and verdict.get("is_issue") in ("YES", "NO")
+    ]
+    if not docs:
+        return
+    try:
+        prefilter_samples.insert_many(docs, ordered=False)
+    except Exception as e:
+        print(f"[Prefilter] could not log training samples: {e}")
+
+
+def classify_articles(articles, concurrency=None, batch_size=None, use_cache=True, prefilter=None):
+    """Classifies articles in batches of `batch_size` with bounded concurrency.
+
+    Articles whose content hash is already in classification_cache reuse the
+    stored verdict and never reach Claude. Of the rest, those the optional
+    `prefilter` is confident Claude would reject get a local NO verdict
+    (except for a small audit sample). Returns (pairs, stats) where pairs are
+    (article, result) in the original order. Request pacing is handled by
+    the shared claude_rate_limiter, not by the worker count.
+    """
+    stats = {"cache_hits": 0, "cache_misses": 0}
+    if not articles:
+        return [], stats
+
+    keys = [classification_cache_key(article) for article in articles]
+    cached = load_cached_verdicts(keys) if use_cache else {}
+    results = [cached.get(key) for key in keys]
+    pending = [i for i, result in enumerate(results) if result is None]
+    stats["cache_hits"] = len(articles) - len(pending)
+    stats["cache_misses"] = len(pending)
+
+    flagged = set()
+    if prefilter is not None and prefilter.enabled:
+        for i in pending:
+            if prefilter.predicts_reject(articles[i]):
+                flagged.add(i)
+                prefilter.stats["flagged"] += 1
+                if random.random() < PREFILTER_AUDIT_RATE:
+                    prefilter.stats["audited"] += 1
+                else:
+                    prefilter.stats["skipped"] += 1
+                    results[i] = {"is_issue": "NO", "prefiltered": True}
+        pending = [i for i in pending if results[i] is None]
+
+    if pending:
+        to_classify = [articles[i] for i in pending]
+        batch_size = max(1, batch_size or CLASSIFY_BATCH_SIZE)
+        chunks = [to_classify[i:i + batch_size] for i in range(0, len(to_classify), batch_size)]
+        workers = max(1, min(concurrency or CLASSIFY_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="classify") as pool:
+            verdicts = [verdict for chunk in pool.map(classify_batch, chunks) for verdict in chunk]
+        for i, verdict in zip(pending, verdicts):
+            results[i] = verdict
+            if prefilter is not None:
+                prefilter.record(i in flagged, verdict)
+        if use_cache:
+            store_cached_verdicts((keys[i], results[i]) for i in pending)
+            log_prefilter_samples((articles[i], results[i]) for i in pending)
+
+    return list(zip(articles, results)), stats
+
+
+def filter_already_stored(articles):
+    """Drops articles whose id, title or link is already stored, using one query."""
+    if not articles:
+        return []
+
+    ids = [a["article_id"] for a in articles if a.get("article_id")]
+    titles = [a["title"] for a in articles if a.get("title")]
+    links = [a["link"] for a in articles if a.get("link")]
+
+    stored_ids, stored_headlines, stored_urls = set(), set(), set()
+    query = {
+        "$or": [
+            {"article_id": {"$in": ids}},
+            {"headline": {"$in": titles}},
+            {"url": {"$in": links}},
         ]
-        for url in urls:
-            resp = requests.get(url)
-            resp.raise_for_status()
-            articles = resp.json().get("results", [])
-            for art in articles:
+    }
+    for doc in collection.find(query, {"_id": 0, "article_id": 1, "headline": 1, "url": 1}):
+        stored_ids.add(doc.get("article_id"))
+        stored_headlines.add(doc.get("headline"))
+        stored_urls.add(doc.get("url"))
+
+    return [
+        a for a in articles
+        if a.get("article_id") not in stored_ids
+        and a.get("title") not in stored_headlines
+        and a.get("link") not in stored_urls
+    ]
+
+
+def headline_shingles(text):
+    """Normalized word set of a headline: lowercased, numbers as digits, stopwords dropped."""
+    words = re.findall(r"\w+", clean_text(text).lower())
+    return {HEADLINE_NUMBER_WORDS.get(w, w) for w in words} - HEADLINE_STOPWORDS
+
+
+MERSENNE_61 = (1 << 61) - 1
+_minhash_rng = random.Random(0x5EED)
+MINHASH_PERMUTATIONS = [
+    (_minhash_rng.randrange(1, MERSENNE_61), _minhash_rng.randrange(MERSENNE_61))
+    for _ in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+
+
+def minhash_bands(shingles):
+    """LSH band keys of the MinHash signature of `shingles` (empty if there are none)."""
+    if not shingles:
+        return []
+    values = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") % MERSENNE_61
+        for s in shingles
+    ]
+    signature = [min((a * v + b) % MERSENNE_61 for v in values) for a, b in MINHASH_PERMUTATIONS]
+    bands = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=6).hexdigest()
+        bands.append(f"{band}:{digest}")
+    return bands
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def is_near_duplicate(a, b):
+    """Whether two headline word sets are close enough to be the same story."""
+    shortest = min(len(a), len(b))
+    if shortest < NEAR_DUPLICATE_MIN_WORDS:
+        return False
+    if shortest < NEAR_DUPLICATE_SHORT_WORDS:
+        return jaccard(a, b) >= NEAR_DUPLICATE_SHORT_MIN_JACCARD
+    return jaccard(a, b) >= NEAR_DUPLICATE_MIN_JACCARD
+
+
+def filter_near_duplicates(articles, band_index=None):
+    """Drops articles whose headline is a fuzzy re-post of a stored or earlier one.
+
+    Candidates are found through the (title_minhash_bands, published_date)
+    index among articles from the last NEAR_DUPLICATE_WINDOW_HOURS, so only
+    recent headlines sharing an LSH band are compared (see is_near_duplicate).
+    Pass the same `band_index` dict across calls to also catch
+    repeats between batches of one run. Returns (kept, dropped_count).
+    """
+    shingle_sets = [headline_shingles(a.get("title")) for a in articles]
+    article_bands = [minhash_bands(shingles) for shingles in shingle_sets]
+    all_bands = {band for bands in article_bands for band in bands}
+
+    if band_index is None:
+        band_index = {}
+
+    def add_to_index(shingles, bands):
+        shingles = frozenset(shingles)
+        for band in bands:
+            band_index.setdefault(band, []).append(shingles)
+
+    if all_bands:
+        for doc in collection.find(
+            {
+                "title_minhash_bands": {"$in": list(all_bands)},
+                "published_date": {
+                    "$gte": datetime.now(timezone.utc) - timedelta(hours=NEAR_DUPLICATE_WINDOW_HOURS)
+                },
+            },
+            {"title_shingles": 1, "title_minhash_bands": 1},
+        ):
+            if doc.get("title_shingles"):
+                add_to_index(doc["title_shingles"], doc.get("title_minhash_bands") or [])
+
+    kept = []
+    for article, shingles, bands in zip(articles, shingle_sets, article_bands):
+        if shingles:
+            neighbours = {other for band in bands for other in band_index.get(band, [])}
+            if any(is_near_duplicate(shingles, other) for other in neighbours):
+                continue
+            add_to_index(shingles, bands)
+        kept.append(article)
+    return kept, len(articles) - len(kept)
+
+
+def bump_collection_versions(dates):
+    """Increments the version of every touched YYYY-MM-DD date and the global version."""
+    if not dates:
+        return
+    operations = [
+        UpdateOne({"_id": key}, {"$inc": {"version": 1}}, upsert=True)
+        for key in sorted(dates) + ["_all"]
+    ]
+    try:
+        collection_versions.bulk_write(operations, ordered=False)
+    except Exception as e:
+        print(f"[Versions] update failed: {e}")
+
+
+class ArticleWriter:
+    """Buffers article documents and writes them as unordered upserts on article_id.
+
+    Upserts use $setOnInsert, so an article another run stored first is left
+    untouched. Duplicate-key races on the unique article_id index are counted
+    rather than raised.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=None):
+        self.batch_size = max(1, batch_size or INSERT_BATCH_SIZE)
+        self.flush_interval = flush_interval if flush_interval is not None else INSERT_FLUSH_INTERVAL
+        self.buffer = []
+        self.stored = 0
+        self.duplicates = 0
+        self.stored_dates = set()
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def add(self, doc):
+        with self.lock:
+            self.buffer.append(doc)
+            due = time.monotonic() - self.last_flush >= self.flush_interval
+            if len(self.buffer) >= self.batch_size or due:
+                self._flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        docs, self.buffer = self.buffer, []
+        operations = [
+            UpdateOne({"article_id": doc["article_id"]}, {"$setOnInsert": doc}, upsert=True)
+            for doc in docs
+        ]
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+            inserted = list(result.upserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+            inserted = [item["index"] for item in e.details.get("upserted", [])]
+
+        for index in inserted:
+            published = docs[index].get("published_date")
+            if published:
+                self.stored_dates.add(published.strftime("%Y-%m-%d"))
+        self.stored += len(inserted)
+        self.duplicates += len(docs) - len(inserted)
+
+
+PIPELINE_DONE = object()
+
+
+def new_stage_stats():
+    return {"items_in": 0, "items_out": 0, "busy_seconds": 0.0, "started_at": time.monotonic()}
+
+
+def run_pipeline_stage(name, handler, inbox, outbox, stats, errors):
+    """Feeds batches from `inbox` through `handler` into `outbox` until PIPELINE_DONE.
+
+    After a failure the stage keeps draining its inbox, so upstream stages are
+    never left blocked on a full queue; downstream always receives PIPELINE_DONE.
+    """
+    failed = False
+    try:
+        while True:
+            batch = inbox.get()
+            if batch is PIPELINE_DONE:
+                break
+            if failed:
+                continue
+            started = time.monotonic()
+            try:
+                out = handler(batch)
+            except Exception as e:
+                print(f"[Pipeline:{name}] {e}")
+                errors.append(f"{name}: {e}")
+                failed = True
+                continue
+            stats["busy_seconds"] += time.monotonic() - started
+            stats["items_in"] += len(batch)
+            stats["items_out"] += len(out)
+            if out and outbox is not None:
+                outbox.put(out)
+    finally:
+        stats["elapsed_seconds"] = time.monotonic() - stats.pop("started_at")
+        if outbox is not None:
+            outbox.put(PIPELINE_DONE)
+
+
+def run_pipeline_source(name, batches, outbox, stats, errors):
+    """Pushes batches produced by the `batches` iterable into `outbox`."""
+    try:
+        started = time.monotonic()
+        for batch in batches:
+            stats["busy_seconds"] += time.monotonic() - started
+            stats["items_out"] += len(batch)
+            if batch:
+                outbox.put(batch)
+            started = time.monotonic()
+    except Exception as e:
+        print(f"[Pipeline:{name}] {e}")
+        errors.append(f"{name}: {e}")
+    finally:
+        stats["elapsed_seconds"] = time.monotonic() - stats.pop("started_at")
+        outbox.put(PIPELINE_DONE)
+
+
+def fetch_feed_pages(feed, high_water_marks, new_ids=None):
+    """Yields each newsdata.io results page for one feed, following nextPage.
+
+    Every article on a page is yielded; filter_already_stored decides what is
+    new. The feed's persisted high-water mark (the newest pubDate seen by the
+    last successful run) only bounds paging: it stops at the first page that
+    reaches NEWS_HWM_GRACE_SECONDS below the mark or contains an already
+    stored article, and after NEWS_MAX_PAGES pages at most. The newest pubDate
+    seen is recorded in `high_water_marks[feed]`; the caller persists it once
+    the run has succeeded. Ids of articles published after the previous mark
+    (the genuinely new ones) are added to `new_ids` if given.
+    """
+    state = feed_state.find_one({"_id": feed}) or {}
+    previous_mark = parse_pub_date(state.get("high_water_mark"))
+    stop_before = previous_mark - timedelta(seconds=NEWS_HWM_GRACE_SECONDS) if previous_mark else None
+    base_url = NEWS_FEED_URL.format(api_key=API_KEY, priority=feed)
+    next_page = None
+
+    for _ in range(NEWS_MAX_PAGES):
+        url = f"{base_url}&page={next_page}" if next_page else base_url
+        resp = http_session.get(url, timeout=NEWS_HTTP_TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
+        results = data.get("results", [])
+
+        reached_known = False
+        for art in results:
+            published = parse_pub_date(art.get("pubDate"))
+            if published and (high_water_marks.get(feed) is None or published > high_water_marks[feed]):
+                high_water_marks[feed] = published
+            if published and stop_before and published < stop_before:
+                reached_known = True
+            if new_ids is not None and art.get("article_id") and (
+                previous_mark is None or (published and published > previous_mark)
+            ):
+                new_ids.add(art["article_id"])
+
+        ids = [art["article_id"] for art in results if art.get("article_id")]
+        if not reached_known and ids:
+            reached_known = collection.find_one({"article_id": {"$in": ids}}, {"_id": 1}) is not None
+
+        yield results
+
+        next_page = data.get("nextPage")
+        if reached_known or not next_page or not results:
+            break
+
+
+def save_high_water_marks(high_water_marks, cap=None):
+    """Persists the feed marks.
+
+    Marks normally only move forward. With a `cap` (the pubDate of the oldest
+    article whose classification failed) every mark is set to at most the cap,
+    even if that moves it back, so the next run pages down to that article.
+    """
+    for feed, mark in high_water_marks.items():
+        if mark is None:
+            continue
+        if cap is not None:
+            update = {"$set": {"high_water_mark": min(mark, cap), "updated_at": datetime.now(timezone.utc)}}
+        else:
+            update = {"$max": {"high_water_mark": mark}, "$set": {"updated_at": datetime.now(timezone.utc)}}
+        feed_state.update_one({"_id": feed}, update, upsert=True)
+
+
+def fetch_feed_batches(feeds, high_water_marks, new_ids=None):
+    """Fetches all feeds in parallel, yielding each page as a batch of usable, unseen articles.
+
+    Pages are yielded as soon as any feed delivers one. The first feed error is
+    re-raised once the other feeds have finished.
+    """
+    pages = queue.Queue()
+
+    def fetch_feed(feed):
+        try:
+            for page in fetch_feed_pages(feed, high_water_marks, new_ids):
+                pages.put(page)
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(PIPELINE_DONE)
+
+    seen_ids = set()
+    error = None
+    with ThreadPoolExecutor(max_workers=len(feeds), thread_name_prefix="feed") as pool:
+        for feed in feeds:
+            pool.submit(fetch_feed, feed)
+
+        remaining = len(feeds)
+        while remaining:
+            page = pages.get()
+            if page is PIPELINE_DONE:
+                remaining -= 1
+                continue
+            if isinstance(page, Exception):
+                error = error or page
+                continue
+
+            batch = []
+            for art in page:
                 article_id = art.get("article_id")
                 if not article_id or article_id in seen_ids:
                     continue
@@ -270,93 +1344,509 @@ def fetch_and_store_news_logic():
                 if source_priority is None or source_priority > 30000:
                     continue
 
-                if collection.find_one({"article_id": article_id}):
-                    continue
+                batch.append(art)
+            yield batch
+
+    if error:
+        raise error
+
+
+def search_prefixes(doc):
+    """Word prefixes of the doc's SEARCH_PREFIX_FIELDS, for the indexed prefix search."""
+    prefixes = set()
+    for field in SEARCH_PREFIX_FIELDS:
+        for word in re.findall(r"\w+", (doc.get(field) or "").lower()):
+            for length in range(SEARCH_PREFIX_MIN_LENGTH, min(len(word), SEARCH_PREFIX_MAX_LENGTH) + 1):
+                prefixes.add(word[:length])
+    return sorted(prefixes)
+
+
+def build_article_document(article, result):
+    title_shingles = headline_shingles(article.get("title"))
+    doc = {
+        "article_id": article.get("article_id"),
+        "headline": clean_text(result.get("headline", "No headline")),
+        "headline_ai": clean_text(result.get("headline_ai", "No headline")),
+        "source": clean_text(article.get("source_id", "Unknown")),
+        "url": clean_text(article.get("link", "No URL")),
+        "published_date": parse_pub_date(article.get("pubDate")),
+        "description": clean_text(result.get("description", "")),
+        "description_ai": clean_text(result.get("description_ai", "")),
+        "content": clean_text(result.get("content", "")),
+        "source_priority": article.get("source_priority"),
+        "tags": article.get("category", []),
+        "keywords": article.get("keywords", []),
+        "issue_reason": result.get("reason_html", ""),
+        "stored_at": datetime.now(timezone.utc),
+        "department": result.get("department", "Unknown"),
+        "title_shingles": sorted(title_shingles),
+        "title_minhash_bands": minhash_bands(title_shingles),
+    }
+    doc["search_prefixes"] = search_prefixes(doc)
+    return doc
 
-                if collection.find_one({"headline": art.get("title")}):
-                    continue
 
-                if collection.find_one({"url": art.get("link")}):
-                    continue
+def fetch_and_store_news_logic():
+    """Runs ingest as a streaming pipeline: fetch → dedup → classify → clean → persist.
+
+    Each stage runs in its own thread and hands batches to the next through a
+    bounded queue (PIPELINE_QUEUE_SIZE), so the top-priority feed is being
+    classified and stored while later feeds are still downloading, and a slow
+    stage applies backpressure upstream.
+    """
+    writer = ArticleWriter()
+    prefilter = IssuePreFilter.from_history()
+    metrics_before = classification_metrics.snapshot()
+    high_water_marks = {}
+    new_ids = set()
+    band_index = {}
+    counters = {"near_duplicates": 0, "cache_hits": 0, "cache_misses": 0, "classification_failures": 0}
+    # Oldest pubDate among articles Claude could not classify; the marks are
+    # not advanced past it so the next run pages back to them.
+    oldest_failed = []
+    errors = []
+
+    def dedup(batch):
+        kept, dropped = filter_near_duplicates(filter_already_stored(batch), band_index)
+        counters["near_duplicates"] += dropped
+        return kept
+
+    def classify(batch):
+        classified, cache_stats = classify_articles(batch, prefilter=prefilter)
+        counters["cache_hits"] += cache_stats["cache_hits"]
+        counters["cache_misses"] += cache_stats["cache_misses"]
+        for article, result in classified:
+            if result is None:
+                counters["classification_failures"] += 1
+                published = parse_pub_date(article.get("pubDate"))
+                if published and (not oldest_failed or published < oldest_failed[0]):
+                    oldest_failed[:] = [published]
+        return classified
+
+    def clean(pairs):
+        return [
+            build_article_document(article, result)
+            for article, result in pairs
+            if isinstance(result, dict) and result.get("is_issue") == "YES"
+        ]
 
-                all_articles.append(art)
+    def persist(docs):
+        for doc in docs:
+            writer.add(doc)
+        return docs
+
+    stage_names = ["fetch", "dedup", "classify", "clean", "persist"]
+    stats = {name: new_stage_stats() for name in stage_names}
+    queues = [queue.Queue(maxsize=PIPELINE_QUEUE_SIZE) for _ in stage_names[1:]]
+
+    threads = [threading.Thread(
+        target=run_pipeline_source,
+        args=("fetch", fetch_feed_batches(NEWS_FEEDS, high_water_marks, new_ids), queues[0], stats["fetch"], errors),
+        name="ingest-fetch",
+    )]
+    handlers = [dedup, classify, clean, persist]
+    for i, (name, handler) in enumerate(zip(stage_names[1:], handlers)):
+        outbox = queues[i + 1] if i + 1 < len(queues) else None
+        threads.append(threading.Thread(
+            target=run_pipeline_stage,
+            args=(name, handler, queues[i], outbox, stats[name], errors),
+            name=f"ingest-{name}",
+        ))
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
 
-        for article in all_articles:
-            result = check_if_issue(article)
-            if not result or not isinstance(result, dict):
-                continue
+    try:
+        writer.flush()
+    except Exception as e:
+        errors.append(f"persist: {e}")
+    invalidate_summaries(writer.stored_dates)
+    bump_collection_versions(writer.stored_dates)
+
+    for stage in stats.values():
+        stage["busy_seconds"] = round(stage["busy_seconds"], 3)
+        stage["elapsed_seconds"] = round(stage["elapsed_seconds"], 3)
+        stage["items_per_second"] = (
+            round(stage["items_out"] / stage["busy_seconds"], 2) if stage["busy_seconds"] else None
+        )
 
-            if result.get("is_issue") != "YES":
-                # time.sleep(3)
-                continue
+    result = {
+        "articles_fetched": writer.stored,
+        "new_candidates": len(new_ids),
+        **counters,
+        "prefilter": prefilter.report(),
+        "classification": ClassificationMetrics.summarize(classification_metrics.snapshot(), metrics_before),
+        "stages": stats,
+    }
+    if errors:
+        return {"status": "error", "message": "; ".join(errors), **result}
 
-            collection.insert_one({
-                "article_id": article.get("article_id"),
-                "headline": clean_text(result.get("headline", "No headline")),
-                "headline_ai": clean_text(result.get("headline_ai", "No headline")),
-                "source": clean_text(article.get("source_id", "Unknown")),
-                "url": clean_text(article.get("link", "No URL")),
-                "published_date": clean_text(article.get("pubDate", "Unknown")),
-                "description": clean_text(result.get("description", "")),
-                "description_ai": clean_text(result.get("description_ai", "")),
-                "content": clean_text(result.get("content", "")),
-                "source_priority": article.get("source_priority"),
-                "tags": article.get("category", []),
-                "keywords": article.get("keywords", []),
-                "issue_reason": result.get("reason_html", ""),
-                "stored_at": datetime.now(timezone.utc),
-                "department": result.get("department", "Unknown"),
-            })
-            stored_count += 1
-            time.sleep(3)
+    # Only advance the feed marks once every fetched article has been processed,
+    # and keep them just below any article whose classification failed.
+    cap = oldest_failed[0] if oldest_failed else None
+    if counters["classification_failures"] and cap is None:
+        return {"status": "success", **result}
+    save_high_water_marks(high_water_marks, cap)
+    return {"status": "success", **result}
 
-        return {"status": "success", "articles_fetched": stored_count}
 
-    except Exception as e:
-        print(e)
-        return {"status": "error", "message": str(e)}
+ARTICLE_FIELDS = [
+    "article_id", "headline", "headline_ai", "description", "content",
+    "published_date", "url", "issue_reason", "department",
+]
 
 
-def get_articles_logic(time_format="%Y-%m-%d %H:%M:%S", date_str=None):
-    """Fetches articles from the DB, either from the last 24h or for a specific date."""
+SEARCH_RESULT_FIELDS = ARTICLE_FIELDS + ["description_ai", "tags", "keywords"]
+
+
+def build_articles_query(date_str=None):
+    """Date-range filter for a specific day, or for the last 24h if no date is given."""
     if date_str:
-        date_start = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-        date_end = date_start + timedelta(days=1)
-        lower_bound = date_start.strftime(time_format)
-        upper_bound = date_end.strftime(time_format)
-    else:
-        now_utc = datetime.now(timezone.utc)
-        past_24h_utc = now_utc - timedelta(hours=24)
-        lower_bound = past_24h_utc.strftime(time_format)
-        upper_bound = now_utc.strftime(time_format)
+        lower_bound = datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return {"published_date": {"$gte": lower_bound, "$lt": lower_bound + timedelta(days=1)}}
+    now_utc = datetime.now(timezone.utc)
+    return {"published_date": {"$gte": now_utc - timedelta(hours=24), "$lte": now_utc}}
 
-    query = {"published_date": {"$gte": lower_bound, "$lte": upper_bound}}
-    articles = list(collection.find(query).sort("published_date", -1))
-    
-    
-    return [
-        {
-            "headline": a.get("headline"),
-            "headline_ai": a.get("headline_ai"),
-            "description": a.get("description"),
-            "content": a.get("content"),
-            "published_date": a.get("published_date"),
-            "url": a.get("url"),
-            "issue_reason": a.get("issue_reason"),
-            "department": a.get("department"),
-        } for a in articles
-    ]
 
-def summarize_news_logic(articles):
-    """Contains the logic to summarize a list of articles."""
+def encode_cursor(doc):
+    """Opaque keyset cursor pointing just after `doc` in (published_date, _id) order."""
+    raw = json.dumps([doc["published_date"].isoformat(), str(doc["_id"])])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token):
+    if not token:
+        return None
+    try:
+        published, oid = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return parse_pub_date(datetime.fromisoformat(published)), ObjectId(oid)
+    except Exception:
+        raise ValueError("Invalid 'cursor' parameter")
+
+
+def find_articles(query, fields, limit=None, cursor=None):
+    """Returns a Mongo cursor over matching articles, newest first.
+
+    Paging is keyset-based on (published_date, _id): `cursor` is the decoded
+    position of the last article already returned. One extra document beyond
+    `limit` is fetched so callers can tell whether another page exists.
+    """
+    if cursor:
+        after_date, after_id = cursor
+        query = {"$and": [query, {"$or": [
+            {"published_date": {"$lt": after_date}},
+            {"published_date": after_date, "_id": {"$lt": after_id}},
+        ]}]}
+
+    projection = {field: 1 for field in fields}
+    projection["published_date"] = 1
+    docs = collection.find(query, projection).sort([("published_date", -1), ("_id", -1)])
+    if limit:
+        docs = docs.limit(limit + 1)
+    return docs
+
+
+def serialize_article(doc, fields, time_format="%Y-%m-%d %H:%M:%S"):
+    return {
+        field: format_pub_date(doc.get(field), time_format) if field == "published_date" else doc.get(field)
+        for field in fields
+    }
+
+
+def get_articles_logic(time_format="%Y-%m-%d %H:%M:%S", date_str=None, fields=None):
+    """Fetches articles from the DB, either from the last 24h or for a specific date."""
+    fields = fields or ARTICLE_FIELDS
+    docs = find_articles(build_articles_query(date_str), fields)
+    return [serialize_article(a, fields, time_format) for a in docs]
+
+def articles_fingerprint(articles):
+    """Identifies an article set by its ids and summarized fields, ignoring order."""
+    entries = sorted(
+        f"{a.get('article_id')}:"
+        f"{hashlib.sha256((a.get('headline_ai') or '').encode('utf-8')).hexdigest()}:"
+        f"{hashlib.sha256((a.get('issue_reason') or '').encode('utf-8')).hexdigest()}"
+        for a in articles
+    )
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+def article_dates(articles):
+    """Distinct YYYY-MM-DD days covered by serialized articles."""
+    return sorted({str(a.get("published_date"))[:10] for a in articles if a.get("published_date")})
+
+
+def load_cached_summary(fingerprint):
+    try:
+        doc = summary_cache.find_one_and_update(
+            {"_id": fingerprint},
+            {"$set": {"last_used_at": datetime.now(timezone.utc)}},
+            projection={"summary": 1},
+        )
+        return doc["summary"] if doc else None
+    except Exception as e:
+        print(f"[Summary cache] lookup failed: {e}")
+        return None
+
+
+def store_cached_summary(fingerprint, summary, dates, kind="full"):
+    now = datetime.now(timezone.utc)
+    try:
+        summary_cache.update_one(
+            {"_id": fingerprint},
+            {"$set": {"summary": summary, "dates": dates, "kind": kind, "created_at": now, "last_used_at": now}},
+            upsert=True,
+        )
+        # Least-recently-used entries beyond the cap are evicted; the TTL index
+        # on last_used_at removes anything idle for too long.
+        excess = summary_cache.count_documents({}) - SUMMARY_CACHE_MAX_ENTRIES
+        if excess > 0:
+            stale = summary_cache.find({}, {"_id": 1}).sort("last_used_at", 1).limit(excess)
+            summary_cache.delete_many({"_id": {"$in": [doc["_id"] for doc in stale]}})
+    except Exception as e:
+        print(f"[Summary cache] write failed: {e}")
+
+
+def invalidate_summaries(dates):
+    """Drops cached full summaries covering any of the given YYYY-MM-DD dates.
+
+    Per-department partials are kept: their fingerprints only match while a
+    partition is unchanged, so untouched departments stay reusable.
+    """
+    if not dates:
+        return
+    try:
+        summary_cache.delete_many({"dates": {"$in": sorted(dates)}, "kind": {"$ne": "partition"}})
+    except Exception as e:
+        print(f"[Summary cache] invalidation failed: {e}")
+
+
+def summarize_news_logic(articles, date_str=None):
+    """Summarizes a list of articles, reusing a cached summary for the same set.
+
+    Pass `date_str` only when `articles` is that whole calendar day; the day's
+    running summary is then updated incrementally. Rolling windows (last 24h)
+    are summarized on their own and never touch the per-day state.
+    """
     if not articles:
         return {"status": "error", "message": "No articles to summarize"}
 
+    if date_str:
+        return cached_summary(articles, lambda arts: summarize_incrementally(date_str, arts))
+    return cached_summary(articles, summarize_map_reduce)
+
+
+def cached_summary(articles, generate, kind="full"):
+    """Returns the cached summary for this exact article set, or generates and caches it."""
+    fingerprint = articles_fingerprint(articles)
+    cached = load_cached_summary(fingerprint)
+    if cached is not None:
+        return {"status": "success", "summary": cached, "cached": True}
+
+    result = generate(articles)
+    if result["status"] == "success":
+        store_cached_summary(fingerprint, result["summary"], article_dates(articles), kind=kind)
+    return result
+
+
+def summarize_incrementally(date_str, articles):
+    """Updates the stored summary for one day by folding in only the new articles.
+
+    The day's last summary and the article ids it covers are kept in
+    summary_state. If those ids are all still present, only the delta is sent
+    to the model; otherwise (first summary of the day, removed articles or a
+    delta above INCREMENTAL_SUMMARY_MAX_DELTA) the day is summarized in full.
+    """
+    state = summary_state.find_one({"_id": date_str}) or {}
+    known_ids = set(state.get("article_ids", []))
+    current_ids = {a.get("article_id") for a in articles}
+    delta = [a for a in articles if a.get("article_id") not in known_ids]
+
+    result = None
+    if state and known_ids <= current_ids and len(delta) <= INCREMENTAL_SUMMARY_MAX_DELTA:
+        if not delta:
+            result = {"status": "success", "summary": state["summary"]}
+        else:
+            result = fold_into_summary(state["summary"], delta)
+    if result is None or result["status"] != "success":
+        result = summarize_map_reduce(articles)
+
+    if result["status"] == "success":
+        summary_state.replace_one(
+            {"_id": date_str},
+            {
+                "summary": result["summary"],
+                "article_ids": sorted(i for i in current_ids if i),
+                "updated_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+    return result
+
+
+def normalize_issue(issue):
+    return " ".join(re.findall(r"\w+", str(issue).lower()))
+
+
+def fold_into_summary(summary, new_articles):
+    """Asks Claude only for the categories/issues the new articles add, then merges them.
+
+    The model sees the existing issues so it can skip ones already listed;
+    additions that still repeat an existing issue (ignoring case and
+    punctuation) are dropped before merging.
+    """
+    existing = summary.get("categories", [])
+    prompt = f"""
+You are a high-precision regional news summarization AI focused on Andhra Pradesh.
+
+An existing daily summary already contains these categories and issues (JSON):
+{json.dumps({"categories": existing}, ensure_ascii=False)}
+
+Here are {len(new_articles)} NEW public news issues, each with a short explanation:
+\"\"\"{format_issue_lines(new_articles)}\"\"\"
+
+Your task:
+1. ONLY INCLUDE major public issues (governance failures, disasters, crime, corruption, unrest, major public complaints, severe infrastructure problems, public health crises, service delivery failures).
+2. Ignore minor updates, political promotion, soft news, or Telangana-related content.
+3. Skip any issue the existing summary already covers (the same incident, even if worded differently).
+4. Put each included issue under an existing category name when it fits, otherwise under a new logical category.
+5. Each issue should stay in its original sentence form, with location (district/city/town) included.
+
+Respond ONLY with the additions in this strict JSON format (an empty list if nothing qualifies):
+{{"categories": [{{"category_name": "...", "issues": ["..."]}}]}}
+"""
+    try:
+        response = client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=4000,
+            temperature=0,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        text = response.content[0].text.strip()
+        json_text = re.search(r"\{.*\}", text, re.DOTALL)
+        if not json_text:
+            return {"status": "error", "message": "Model did not return valid JSON"}
+        additions = json.loads(json_text.group(0)).get("categories", [])
+        known = {normalize_issue(issue) for c in existing for issue in c.get("issues", [])}
+        additions = [
+            {**category, "issues": [i for i in category.get("issues", []) if normalize_issue(i) not in known]}
+            for category in additions
+            if isinstance(category, dict)
+        ]
+        merged = combine_categories(existing + [c for c in additions if c["issues"]])
+        return {"status": "success", "summary": merged}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def summary_partitions(articles):
+    """Department partitions for a map-reduce summary, or None if one prompt suffices."""
+    if len(articles) <= SUMMARY_MAP_REDUCE_THRESHOLD:
+        return None
+    partitions = {}
+    for art in articles:
+        partitions.setdefault(art.get("department") or "Unknown", []).append(art)
+    return partitions if len(partitions) > 1 else None
+
+
+def summarize_map_reduce(articles):
+    """Summarizes large days per department in parallel, then merges the partials.
+
+    Days up to SUMMARY_MAP_REDUCE_THRESHOLD articles use a single prompt. Each
+    department partial is cached on its own, so a new article only re-runs the
+    partition it belongs to.
+    """
+    partitions = summary_partitions(articles)
+    if partitions is None:
+        return generate_summary(articles)
+
+    workers = max(1, min(SUMMARY_MAP_CONCURRENCY, len(partitions)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as pool:
+        partials = list(pool.map(
+            lambda part: cached_summary(part, generate_summary, kind="partition"),
+            partitions.values(),
+        ))
+
+    failed = [p for p in partials if p["status"] != "success"]
+    if failed:
+        return {"status": "error", "message": failed[0].get("message", "Partition summary failed")}
+
+    categories = [c for p in partials for c in p["summary"].get("categories", [])]
+    return merge_summary_categories(categories)
+
+
+def combine_categories(categories):
+    """Deterministic merge: joins categories with the same name, dropping repeated issues."""
+    merged = {}
+    for category in categories:
+        name = (category.get("category_name") or "Other").strip()
+        entry = merged.setdefault(name.lower(), {"category_name": name, "issues": []})
+        for issue in category.get("issues", []):
+            if issue not in entry["issues"]:
+                entry["issues"].append(issue)
+    return {"categories": list(merged.values())}
+
+
+def merge_summary_categories(categories):
+    """Small merge pass: asks Claude only which partial categories to regroup.
+
+    The model returns a mapping from each category name to the merged name,
+    so its output grows with the number of categories, not issues; the issues
+    are then regrouped locally by combine_categories.
+    """
+    combined = combine_categories(categories)
+    names = [c["category_name"] for c in combined["categories"]]
+    if len(names) < 2:
+        return {"status": "success", "summary": combined}
+
+    samples = {c["category_name"]: c["issues"][:1] for c in combined["categories"]}
+    prompt = f"""
+You are merging category lists produced separately for each government department in Andhra Pradesh.
+
+Input category names, each with one example issue (JSON):
+{json.dumps(samples, ensure_ascii=False)}
+
+Your task:
+1. Decide which categories cover the same theme (for example "Floods" and "Heavy Rains") and should be merged.
+2. Map EVERY input category name to the name it should appear under (itself if it stays separate).
+
+Respond ONLY in this strict JSON format:
+{{"mapping": {{"<input category name>": "<merged category name>"}}}}
+"""
+    try:
+        response = client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=min(4000, 200 + 40 * len(names)),
+            temperature=0,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        text = response.content[0].text.strip()
+        json_text = re.search(r"\{.*\}", text, re.DOTALL)
+        mapping = json.loads(json_text.group(0)).get("mapping") if json_text else None
+        if not isinstance(mapping, dict):
+            raise ValueError("Merge pass did not return a mapping")
+        renamed = [
+            {**category, "category_name": str(mapping.get(category["category_name"]) or category["category_name"])}
+            for category in combined["categories"]
+        ]
+        return {"status": "success", "summary": combine_categories(renamed)}
+    except Exception as e:
+        print(f"[Summary merge] falling back to name-based merge: {e}")
+        return {"status": "success", "summary": combined}
+
+
+def format_issue_lines(articles):
     combined_content = ""
     for art in articles:
-        headline = art.get("headline_ai", "").strip()
-        reason = art.get("issue_reason", "N/A").strip()
+        headline = (art.get("headline_ai") or "").strip()
+        reason = (art.get("issue_reason") or "N/A").strip()
         combined_content += f"- {headline} (Issue: {reason})\n"
+    return combined_content
+
+
+def build_summary_prompt(articles):
+    combined_content = format_issue_lines(articles)
 
     prompt = f"""
 You are a high-precision regional news summarization AI focused on Andhra Pradesh.
@@ -389,9 +1879,15 @@ Respond ONLY in this strict JSON format:
 
 ⚠️ Return **only the JSON**. No explanations, comments or markdown.
 """
+    return prompt
+
+
+def generate_summary(articles):
+    """Contains the logic to summarize a list of articles."""
+    prompt = build_summary_prompt(articles)
     try:
         response = client.messages.create(
-        model="claude-3-5-sonnet-20240620",
+        model=CLAUDE_MODEL,
         max_tokens= 8000, 
         temperature=0,
         messages=[{"role": "user", "content": prompt}]
@@ -408,6 +1904,384 @@ Respond ONLY in this strict JSON format:
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+class CategoryStreamParser:
+    """Incrementally extracts complete category objects from streamed summary JSON.
+
+    Feed it text chunks as they arrive; it returns each object of the
+    top-level "categories" array as soon as its closing brace is seen.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.stack = []
+        self.in_string = False
+        self.escaped = False
+        self.category_start = None
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        completed = []
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"' and self.stack:
+                self.in_string = True
+            elif char in "{[":
+                if char == "{" and self.stack == ["{", "["]:
+                    self.category_start = self.position
+                self.stack.append(char)
+            elif char in "}]" and self.stack:
+                self.stack.pop()
+                if char == "}" and self.stack == ["{", "["] and self.category_start is not None:
+                    try:
+                        completed.append(json.loads(self.buffer[self.category_start:self.position + 1]))
+                    except ValueError:
+                        pass
+                    self.category_start = None
+            self.position += 1
+        return completed
+
+
+def stream_summary_events(articles):
+    """Yields ("category", dict) as the model completes each one, then ("done", summary).
+
+    A cached summary for the same article set is replayed immediately. Days
+    above SUMMARY_MAP_REDUCE_THRESHOLD are summarized per department (see
+    stream_partitioned_summary). On success the summary is stored in the
+    summary cache.
+    """
+    fingerprint = articles_fingerprint(articles)
+    cached = load_cached_summary(fingerprint)
+    if cached is not None:
+        for category in cached.get("categories", []):
+            yield "category", category
+        yield "done", {"summary": cached, "cached": True}
+        return
+
+    partitions = summary_partitions(articles)
+    if partitions is not None:
+        yield from stream_partitioned_summary(articles, fingerprint, partitions)
+        return
+
+    parser = CategoryStreamParser()
+    categories = []
+    with client.messages.stream(
+        model=CLAUDE_MODEL,
+        max_tokens=8000,
+        temperature=0,
+        messages=[{"role": "user", "content": build_summary_prompt(articles)}],
+    ) as stream:
+        for text in stream.text_stream:
+            for category in parser.feed(text):
+                categories.append(category)
+                yield "category", category
+
+    summary = {"categories": categories}
+    if categories:
+        store_cached_summary(fingerprint, summary, article_dates(articles))
+    yield "done", {"summary": summary, "cached": False}
+
+
+def stream_partitioned_summary(articles, fingerprint, partitions):
+    """Map-reduce counterpart of stream_summary_events for large days.
+
+    Each department partial (cached like in summarize_map_reduce) streams its
+    categories as soon as it finishes; "done" carries the merged summary,
+    whose categories may regroup the streamed ones.
+    """
+    categories = []
+    workers = max(1, min(SUMMARY_MAP_CONCURRENCY, len(partitions)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as pool:
+        futures = [
+            pool.submit(cached_summary, part, generate_summary, kind="partition")
+            for part in partitions.values()
+        ]
+        for future in as_completed(futures):
+            partial = future.result()
+            if partial["status"] != "success":
+                raise RuntimeError(partial.get("message", "Partition summary failed"))
+            for category in partial["summary"].get("categories", []):
+                categories.append(category)
+                yield "category", category
+
+    merged = merge_summary_categories(categories)
+    summary = merged["summary"]
+    if summary.get("categories"):
+        store_cached_summary(fingerprint, summary, article_dates(articles))
+    yield "done", {"summary": summary, "cached": False}
+
+
+# --- PDF Rendering ---
+
+class PdfRenderer:
+    """Pool of long-lived headless Chromium browsers that turn HTML into PDF bytes.
+
+    Playwright's sync API is bound to the thread that started it, so every
+    worker thread owns its own driver and browser and pulls jobs from a shared
+    bounded queue. Each job gets a fresh browser context. A browser is
+    relaunched when it is found disconnected, after a failed render, or after
+    `recycle_after` renders.
+    """
+
+    def __init__(self, workers, recycle_after, queue_size):
+        self.workers = max(1, workers)
+        self.recycle_after = max(1, recycle_after)
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            self.threads = [t for t in self.threads if t.is_alive()]
+            for i in range(len(self.threads), self.workers):
+                thread = threading.Thread(target=self._worker, name=f"pdf-renderer-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def render(self, html, timeout=None):
+        timeout = timeout or PDF_RENDER_TIMEOUT
+        self.start()
+        future = Future()
+        try:
+            self.jobs.put((html, future), timeout=timeout)
+        except queue.Full:
+            raise RuntimeError("PDF renderer is busy, try again shortly")
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    def shutdown(self):
+        for _ in self.threads:
+            try:
+                self.jobs.put_nowait(None)
+            except queue.Full:
+                break
+
+    def _worker(self):
+        playwright = sync_playwright().start()
+        browser = None
+        renders = 0
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                html, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if browser is None or not browser.is_connected() or renders >= self.recycle_after:
+                        self._close(browser)
+                        browser = playwright.chromium.launch()
+                        renders = 0
+                    context = browser.new_context()
+                    try:
+                        page = context.new_page()
+                        page.set_content(html)
+                        page.emulate_media(media="screen")
+                        pdf_bytes = page.pdf(format="A4", landscape=False)
+                    finally:
+                        context.close()
+                    renders += 1
+                    future.set_result(pdf_bytes)
+                except Exception as e:
+                    print(f"[PDF renderer] render failed, recycling browser: {e}")
+                    self._close(browser)
+                    browser = None
+                    future.set_exception(e)
+        finally:
+            self._close(browser)
+            playwright.stop()
+
+    @staticmethod
+    def _close(browser):
+        if browser is None:
+            return
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+
+pdf_renderer = PdfRenderer(PDF_RENDER_WORKERS, PDF_RECYCLE_AFTER, PDF_QUEUE_SIZE)
+atexit.register(pdf_renderer.shutdown)
+
+
+def render_pdf_weasyprint(html):
+    """Renders report HTML without a browser, using the bundled DejaVu font as fallback."""
+    # Imported lazily so the Chromium backend works without WeasyPrint's native libraries.
+    from weasyprint import HTML, CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    stylesheet = CSS(
+        string=f"""
+        @font-face {{ font-family: 'DejaVu Sans'; src: url('{FONT_PATH.as_uri()}'); }}
+        body {{ font-family: 'Times New Roman', 'DejaVu Sans', serif; }}
+        """,
+        font_config=font_config,
+    )
+    return HTML(string=html, media_type="screen").write_pdf(
+        stylesheets=[stylesheet], font_config=font_config
+    )
+
+
+PDF_BACKENDS = {
+    "chromium": lambda html: pdf_renderer.render(html),
+    "weasyprint": render_pdf_weasyprint,
+}
+
+
+def render_pdf(html, backend=None):
+    """Renders report HTML to PDF bytes with the configured PDF_BACKEND."""
+    backend = backend or PDF_BACKEND
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}', expected one of {sorted(PDF_BACKENDS)}")
+    return PDF_BACKENDS[backend](html)
+
+
+# --- Report Artifacts ---
+
+def write_artifact(data, extension):
+    """Stores bytes content-addressed under REPORTS_DIR and returns their sha256."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = REPORTS_DIR / f"{digest}.{extension}"
+    if not path.exists():
+        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=REPORTS_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    return digest
+
+
+def artifact_path(digest, extension):
+    return REPORTS_DIR / f"{digest}.{extension}"
+
+
+ARTIFACT_FILES = {"summary_sha256": "json", "html_sha256": "html", "pdf_sha256": "pdf"}
+
+
+def delete_superseded_artifacts(previous, current):
+    """Removes the files of a date's previous build that nothing references any more."""
+    for field, extension in ARTIFACT_FILES.items():
+        digest = previous.get(field)
+        if not digest or digest == current.get(field):
+            continue
+        if report_artifacts.find_one({field: digest}, {"_id": 1}):
+            continue
+        try:
+            artifact_path(digest, extension).unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[Reports] could not delete {digest}.{extension}: {e}")
+
+
+def materialize_daily_report(date_str):
+    """Builds (or reuses) the stored summary, HTML and PDF for one YYYY-MM-DD date.
+
+    Artifacts are regenerated only when the date's article set fingerprint has
+    changed since they were last built. Must run inside an app context.
+    """
+    articles = get_articles_logic(date_str=date_str)
+    if not articles:
+        return {"status": "error", "message": f"No articles found for date {date_str}", "code": 404}
+
+    fingerprint = articles_fingerprint(articles)
+    existing = report_artifacts.find_one({"_id": date_str})
+    if (
+        existing
+        and existing.get("fingerprint") == fingerprint
+        and artifact_path(existing["pdf_sha256"], "pdf").exists()
+    ):
+        return {"status": "success", "artifact": existing}
+
+    summary_data = summarize_news_logic(articles, date_str=date_str)
+    if summary_data.get("status") != "success":
+        return {**summary_data, "code": 500}
+
+    categories = summary_data["summary"].get("categories", [])
+    if not categories:
+        return {"status": "error", "message": "No categories returned for PDF", "code": 500}
+
+    formatted_date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%d-%m-%Y")
+    rendered_html = render_template("code.html", date=formatted_date, categories=categories)
+    pdf_bytes = render_pdf(rendered_html)
+
+    artifact = {
+        "_id": date_str,
+        "fingerprint": fingerprint,
+        "summary_sha256": write_artifact(json.dumps(summary_data["summary"]).encode("utf-8"), "json"),
+        "html_sha256": write_artifact(rendered_html.encode("utf-8"), "html"),
+        "pdf_sha256": write_artifact(pdf_bytes, "pdf"),
+        "article_count": len(articles),
+        "created_at": datetime.now(timezone.utc),
+    }
+    previous = report_artifacts.find_one_and_replace({"_id": date_str}, artifact, upsert=True)
+    if previous:
+        delete_superseded_artifacts(previous, artifact)
+    return {"status": "success", "artifact": artifact}
+
+
+# --- Conditional GET ---
+
+def rolling_window_scope():
+    """Version keys for last-24h endpoints; the hour bucket lets old articles age out."""
+    now = datetime.now(timezone.utc)
+    return [(now - timedelta(days=1)).strftime("%Y-%m-%d"), now.strftime("%Y-%m-%d")], now.strftime("%Y%m%d%H")
+
+
+def date_param_scope():
+    return [request.args.get("date", "")], ""
+
+
+def global_scope():
+    return ["_all"], ""
+
+
+def conditional_get(scope):
+    """Adds an ETag derived from collection versions and answers If-None-Match with 304.
+
+    `scope` returns (version keys, extra token). The ETag covers the request
+    path and query string, so each parameter combination validates separately.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            keys, extra = scope()
+            try:
+                versions = {doc["_id"]: doc.get("version", 0) for doc in collection_versions.find({"_id": {"$in": keys}})}
+            except Exception as e:
+                print(f"[Versions] lookup failed: {e}")
+                return view(*args, **kwargs)
+
+            fingerprint = json.dumps([request.full_path, [versions.get(key, 0) for key in keys], extra])
+            etag = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32]
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = READ_CACHE_CONTROL
+            return response
+        return wrapper
+    return decorator
+
+
 # --- API Endpoints ---
 
 # @app.route("/signup", methods=["POST"])
@@ -466,29 +2340,160 @@ def is_authenticated():
 
 @app.route("/fetch-news")
 def fetch_news_endpoint():
-    result = fetch_and_store_news_logic()
+    result = run_ingest()
     print(result)
-    status_code = 500 if result["status"] == "error" else 200
+    status_code = {"error": 500, "skipped": 409}.get(result["status"], 200)
     return jsonify(result), status_code
 
+def parse_fields_param(allowed_fields):
+    """Reads the optional comma-separated ?fields= selection."""
+    raw = request.args.get("fields")
+    if not raw:
+        return list(allowed_fields)
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in allowed_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def ndjson_response(lines):
+    """Streams an iterable of JSON-serializable rows as newline-delimited JSON."""
+    def generate():
+        for line in lines:
+            yield json.dumps(line, default=str) + "\n"
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def list_articles_response(date_str=None):
+    """Shared handler for the article listing endpoints.
+
+    Supports ?limit= with keyset ?cursor= paging, ?fields= selection and
+    ?format=ndjson streaming. Without a limit the whole range is returned.
+    """
+    try:
+        fields = parse_fields_param(ARTICLE_FIELDS)
+        limit = int(request.args["limit"]) if request.args.get("limit") else None
+        if limit is not None and limit < 1:
+            raise ValueError("'limit' must be a positive integer")
+        cursor = decode_cursor(request.args.get("cursor"))
+        docs = find_articles(build_articles_query(date_str), fields, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    def page():
+        """Yields serialized articles, then a final {"next_cursor": ...} marker."""
+        last = None
+        for count, doc in enumerate(docs):
+            if limit and count >= limit:
+                yield {"next_cursor": encode_cursor(last)}
+                return
+            yield serialize_article(doc, fields)
+            last = doc
+        yield {"next_cursor": None}
+
+    if request.args.get("format") == "ndjson":
+        return ndjson_response(page())
+
+    try:
+        *articles, trailer = page()
+        return jsonify({
+            "status": "success",
+            "count": len(articles),
+            "articles": articles,
+            "next_cursor": trailer["next_cursor"],
+        })
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
 @app.route("/recent-published-articles")
+@conditional_get(rolling_window_scope)
 def recent_published_articles_endpoint():
-    articles = get_articles_logic()
-    return jsonify({"status": "success", "count": len(articles), "articles": articles})
+    return list_articles_response()
 
 @app.route("/published-articles-by-date")
+@conditional_get(date_param_scope)
 def published_articles_by_date_endpoint():
     date_str = request.args.get("date")
     if not date_str:
         return jsonify({"status": "error", "message": "Missing 'date' query param"}), 400
-    
+
+    return list_articles_response(date_str=date_str)
+
+def sse_event(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def live_article_events(last_id):
+    """Yields SSE messages for articles stored after `last_id` (an ObjectId or None).
+
+    A change stream on inserts wakes the loop as soon as ingest writes; on
+    deployments without change streams it polls every LIVE_POLL_INTERVAL.
+    Either way new documents are read by _id order, so a reconnecting client
+    resumes exactly after the last event id it saw. The stream ends after
+    LIVE_MAX_STREAM_SECONDS so idle tabs don't pin worker threads forever.
+    """
+    deadline = time.monotonic() + LIVE_MAX_STREAM_SECONDS
     try:
-        articles = get_articles_logic(date_str=date_str)
-        return jsonify({"status": "success", "count": len(articles), "articles": articles})
-    except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+        stream = collection.watch(
+            [{"$match": {"operationType": "insert"}}],
+            max_await_time_ms=LIVE_HEARTBEAT_SECONDS * 1000,
+        )
+    except PyMongoError:
+        stream = None
+
+    try:
+        if last_id is None:
+            newest = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+            last_id = newest["_id"] if newest else ObjectId()
+        yield sse_event("ready", {"cursor": str(last_id)}, event_id=last_id)
+
+        projection = {field: 1 for field in ARTICLE_FIELDS}
+        while time.monotonic() < deadline:
+            docs = list(collection.find({"_id": {"$gt": last_id}}, projection).sort("_id", 1).limit(100))
+            for doc in docs:
+                last_id = doc["_id"]
+                yield sse_event("article", serialize_article(doc, ARTICLE_FIELDS), event_id=last_id)
+            if len(docs) == 100:
+                continue
+
+            if stream is not None:
+                if stream.try_next() is None:
+                    yield ": keep-alive\n\n"
+            else:
+                time.sleep(LIVE_POLL_INTERVAL)
+                yield ": keep-alive\n\n"
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+@app.route("/live-articles")
+def live_articles_endpoint():
+    """Server-Sent Events feed of newly stored articles.
+
+    Resumes after the id in the Last-Event-ID header (sent automatically by
+    EventSource on reconnect) or ?cursor=; otherwise starts from now.
+    """
+    cursor = request.headers.get("Last-Event-ID") or request.args.get("cursor")
+    try:
+        last_id = ObjectId(cursor) if cursor else None
+    except Exception:
+        return jsonify({"status": "error", "message": "Invalid cursor"}), 400
+
+    return Response(
+        stream_with_context(live_article_events(last_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.route("/summarize-news")
+@conditional_get(rolling_window_scope)
 def summarize_news_endpoint():
     articles = get_articles_logic() # Get last 24h articles
     if not articles:
@@ -498,7 +2503,39 @@ def summarize_news_endpoint():
     status_code = 500 if result["status"] == "error" else 200
     return jsonify(result), status_code
 
+@app.route("/summarize-news-stream")
+def summarize_news_stream_endpoint():
+    """Streams summary categories as they are generated.
+
+    Server-Sent Events by default ("category", then "done" or "error");
+    ?format=ndjson emits {"event": ..., "data": ...} lines instead. Accepts an
+    optional ?date= like /summarize-news-by-date.
+    """
+    date_str = request.args.get("date")
+    try:
+        articles = get_articles_logic(date_str=date_str)
+    except ValueError:
+        return jsonify({"status": "error", "message": "'date' must be YYYY-MM-DD"}), 400
+    if not articles:
+        return jsonify({"status": "error", "message": "No articles found to summarize"}), 404
+
+    def events():
+        try:
+            yield from stream_summary_events(articles)
+        except Exception as e:
+            yield "error", {"message": str(e)}
+
+    if request.args.get("format") == "ndjson":
+        return ndjson_response({"event": event, "data": data} for event, data in events())
+
+    return Response(
+        stream_with_context(sse_event(event, data) for event, data in events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.route("/summarize-news-by-date")
+@conditional_get(date_param_scope)
 def summarize_news_by_date_endpoint():
     date_str = request.args.get("date")
     if not date_str:
@@ -508,7 +2545,7 @@ def summarize_news_by_date_endpoint():
     if not articles:
         return jsonify({"status": "error", "message": "No articles found for that date"}), 404
 
-    result = summarize_news_logic(articles)
+    result = summarize_news_logic(articles, date_str=date_str)
     status_code = 500 if result["status"] == "error" else 200
     return jsonify(result), status_code
 
@@ -530,17 +2567,7 @@ def generate_pdf_endpoint():
     try:
         date_str = datetime.now().strftime("%d-%m-%Y")
         rendered_html = render_template("code.html", date=date_str, categories=categories)
-        
-        pdf_buffer = BytesIO()
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.set_content(rendered_html)
-            page.emulate_media(media="screen")
-            pdf_bytes = page.pdf(format="A4", landscape=False)
-            browser.close()
-            pdf_buffer.write(pdf_bytes)
-            pdf_buffer.seek(0)
+        pdf_buffer = BytesIO(render_pdf(rendered_html))
 
         filename = f"daily_governance_report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
         return send_file(pdf_buffer, mimetype="application/octet-stream", as_attachment=True, download_name=filename)
@@ -554,35 +2581,29 @@ def generate_pdf_by_date_endpoint():
     if not date_str:
         return jsonify({"status": "error", "message": "Missing 'date' parameter"}), 400
 
-    articles = get_articles_logic(date_str=date_str)
-    if not articles:
-        return jsonify({"status": "error", "message": f"No articles found for date {date_str}"}), 404
-
-    summary_data = summarize_news_logic(articles)
-    if summary_data.get("status") != "success":
-        return jsonify(summary_data), 500
-
-    categories = summary_data["summary"].get("categories", [])
-    if not categories:
-        return jsonify({"status": "error", "message": "No categories returned for PDF"}), 500
-
     try:
-        formatted_date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%d-%m-%Y")
-        rendered_html = render_template("code.html", date=formatted_date, categories=categories)
+        datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"status": "error", "message": "'date' must be YYYY-MM-DD"}), 400
 
-        pdf_buffer = BytesIO()
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.set_content(rendered_html)
-            page.emulate_media(media="screen")
-            pdf_bytes = page.pdf(format="A4", landscape=False)
-            browser.close()
-            pdf_buffer.write(pdf_bytes)
-            pdf_buffer.seek(0)
+    try:
+        result = materialize_daily_report(date_str)
+        if result["status"] != "success":
+            code = result.pop("code", 500)
+            return jsonify(result), code
 
+        artifact = result["artifact"]
         filename = f"daily_governance_report_{date_str}.pdf"
-        return send_file(pdf_buffer, mimetype="application/pdf", as_attachment=True, download_name=filename)
+        # Served from disk so Flask handles ETag, Last-Modified and Range requests.
+        return send_file(
+            artifact_path(artifact["pdf_sha256"], "pdf"),
+            mimetype="application/pdf",
+            as_attachment=True,
+            download_name=filename,
+            conditional=True,
+            etag=artifact["pdf_sha256"],
+            last_modified=artifact["created_at"],
+        )
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -603,48 +2624,83 @@ def start_root():
 
 
 @app.route("/search-articles", methods=["GET"])
+@conditional_get(global_scope)
 def search_articles():
     keyword = request.args.get("keyword")
     if not keyword:
         return jsonify({"status": "error", "message": "Missing 'keyword' parameter"}), 400
 
-    keyword = keyword.lower()
-
-    # Build regex query (case-insensitive)
-    regex = {"$regex": re.escape(keyword), "$options": "i"}
+    try:
+        page = max(1, int(request.args.get("page", 1)))
+        page_size = min(SEARCH_MAX_PAGE_SIZE, max(1, int(request.args.get("page_size", SEARCH_PAGE_SIZE))))
+    except ValueError:
+        return jsonify({"status": "error", "message": "'page' and 'page_size' must be integers"}), 400
 
-    query = {
-        "$or": [
-            {"headline": regex},
-            {"headline_ai": regex},
-            {"description": regex},
-            {"description_ai": regex},
-            {"content": regex},
-            {"tags": regex},
-            {"keywords": regex},
-            {"issue_reason": regex},
-        ]
-    }
+    try:
+        fields = parse_fields_param(SEARCH_RESULT_FIELDS)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    # Only plain words reach $search, so "-" and quotes aren't read as operators.
+    terms = re.findall(r"\w+", keyword)
+    if not terms:
+        return jsonify({"status": "error", "message": "'keyword' must contain letters or digits"}), 400
+
+    # Ranked by the weighted text index created in ensure_indexes(). The index
+    # only matches whole (stemmed) words, so when page 1 finds nothing, every
+    # term is matched as a word prefix through the indexed search_prefixes
+    # array instead, newest first. Later pages pass back the reported ?match=.
+    match = request.args.get("match")
+    if match not in (None, "text", "prefix"):
+        return jsonify({"status": "error", "message": "'match' must be 'text' or 'prefix'"}), 400
+
+    projection = {field: 1 for field in fields}
+    projection["_id"] = 0
+
+    def run_query(mode):
+        if mode == "text":
+            query = {"$text": {"$search": " ".join(terms)}}
+            sort = [("score", {"$meta": "textScore"}), ("published_date", -1)]
+            mode_projection = {**projection, "score": {"$meta": "textScore"}}
+        else:
+            prefixes = sorted({
+                term.lower()[:SEARCH_PREFIX_MAX_LENGTH]
+                for term in terms if len(term) >= SEARCH_PREFIX_MIN_LENGTH
+            })
+            if not prefixes:
+                return []
+            query = {"search_prefixes": {"$all": prefixes}}
+            sort = [("published_date", -1), ("_id", -1)]
+            mode_projection = projection
+        return list(
+            collection.find(query, mode_projection)
+            .sort(sort)
+            .skip((page - 1) * page_size)
+            .limit(page_size + 1)
+        )
 
     try:
-        results = list(collection.find(query).sort("published_date", -1))
-        articles = [
-            {
-                "headline": a.get("headline"),
-                "headline_ai": a.get("headline_ai"),
-                "description": a.get("description"),
-                "description_ai": a.get("description_ai"),
-                "content": a.get("content"),
-                "tags": a.get("tags"),
-                "keywords": a.get("keywords"),
-                "published_date": a.get("published_date"),
-                "url": a.get("url"),
-                "issue_reason": a.get("issue_reason"),
-                "department": a.get("department"),
-            }
-            for a in results
-        ]
-        return jsonify({"status": "success", "count": len(articles), "articles": articles})
+        results = run_query(match or "text")
+        if match is None:
+            match = "text"
+            if not results and page == 1:
+                match = "prefix"
+                results = run_query(match)
+
+        has_more = len(results) > page_size
+        articles = [serialize_article(a, fields) for a in results[:page_size]]
+        if request.args.get("format") == "ndjson":
+            return ndjson_response(articles)
+
+        return jsonify({
+            "status": "success",
+            "count": len(articles),
+            "page": page,
+            "page_size": page_size,
+            "has_more": has_more,
+            "match": match,
+            "articles": articles,
+        })
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -652,28 +2708,252 @@ def search_articles():
 
 # --- Background Scheduler ---
 
-def fetch_news_job():
-    """Scheduled job to fetch news."""
-    with app.app_context():
-        print(f"[Scheduler @ {datetime.now()}] Running fetch_and_store_news_logic...")
+scheduler = BackgroundScheduler()
+ingest_schedule = {
+    "interval_seconds": INGEST_MIN_INTERVAL,
+    "next_run_at": None,
+    "last_run": None,
+}
+
+
+def acquire_run_lock(name, ttl):
+    """Takes a Mongo-backed lock shared by all processes; returns an owner token or None."""
+    now = datetime.now(timezone.utc)
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+    try:
+        locks.find_one_and_update(
+            {"_id": name, "expires_at": {"$lt": now}},
+            {"$set": {"owner": owner, "acquired_at": now, "expires_at": now + timedelta(seconds=ttl)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return owner
+    except DuplicateKeyError:
+        return None
+
+
+def release_run_lock(name, owner):
+    locks.delete_one({"_id": name, "owner": owner})
+
+
+def save_ingest_schedule():
+    """Publishes the schedule so any process can serve /scheduler-status."""
+    try:
+        scheduler_state.replace_one({"_id": "ingest"}, dict(ingest_schedule), upsert=True)
+    except Exception as e:
+        print(f"[Scheduler] Could not save schedule state: {e}")
+
+
+def run_ingest():
+    """Runs one ingest cycle unless another process or thread is already running one."""
+    owner = acquire_run_lock("ingest", INGEST_LOCK_TTL)
+    if not owner:
+        return {"status": "skipped", "message": "Another ingest run is already in progress"}
+
+    started_at = datetime.now(timezone.utc)
+    try:
         result = fetch_and_store_news_logic()
-        print(f"[Scheduler @ {datetime.now()}] Result: {result}")
+    finally:
+        release_run_lock("ingest", owner)
+
+    finished_at = datetime.now(timezone.utc)
+    ingest_schedule["last_run"] = {
+        "started_at": started_at.isoformat(),
+        "finished_at": finished_at.isoformat(),
+        "duration_seconds": round((finished_at - started_at).total_seconds(), 3),
+        "status": result["status"],
+        "articles_fetched": result.get("articles_fetched", 0),
+        "new_candidates": result.get("new_candidates", 0),
+        "message": result.get("message"),
+        "classification": result.get("classification", {}),
+    }
+    save_ingest_schedule()
+    return result
 
 
-if __name__ == "__main__":
-# Initialize and start the scheduler
-    scheduler = BackgroundScheduler()
-    # scheduler.add_job(func=fetch_news_job, trigger="interval", minutes=10)
-    scheduler.add_job(fetch_news_job, trigger="cron", hour=6, minute=0)
+def next_ingest_interval(result):
+    """Polls faster while feeds deliver new articles, backs off while they are quiet."""
+    interval = ingest_schedule["interval_seconds"]
+    # Only articles published after the feed marks count; rejected articles that
+    # reappear on every page (answered from the classification cache) don't.
+    flowing = result.get("new_candidates", 0) > 0
+    if result["status"] == "success" and flowing:
+        return max(INGEST_MIN_INTERVAL, interval // 2)
+    return min(INGEST_MAX_INTERVAL, interval * 2)
+
+
+def schedule_next_ingest(delay_seconds):
+    run_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+    scheduler.add_job(
+        fetch_news_job, trigger="date", run_date=run_at, id="fetch_news", replace_existing=True
+    )
+    ingest_schedule["next_run_at"] = run_at.isoformat()
+    save_ingest_schedule()
+
+
+def fetch_news_job():
+    """Scheduled job to fetch news; reschedules itself with an adaptive interval."""
+    result = {"status": "error"}
+    try:
+        with app.app_context():
+            print(f"[Scheduler @ {datetime.now()}] Running fetch_and_store_news_logic...")
+            result = run_ingest()
+            print(f"[Scheduler @ {datetime.now()}] Result: {result}")
+
+            # Pre-build today's and yesterday's reports so downloads are served from
+            # disk; this also folds the new articles into each day's running summary.
+            if result.get("articles_fetched"):
+                today = datetime.now(timezone.utc).date()
+                for day in (today - timedelta(days=1), today):
+                    try:
+                        report = materialize_daily_report(day.strftime("%Y-%m-%d"))
+                        print(f"[Scheduler @ {datetime.now()}] Report {day}: {report['status']}")
+                    except Exception as e:
+                        print(f"[Scheduler @ {datetime.now()}] Report {day} failed: {e}")
+    finally:
+        if result["status"] != "skipped":
+            ingest_schedule["interval_seconds"] = next_ingest_interval(result)
+        schedule_next_ingest(ingest_schedule["interval_seconds"])
+
+
+@app.route("/classification-stats")
+def classification_stats_endpoint():
+    """Per-tier Claude call, latency and token totals since this process started.
+
+    Runs made by a separate scheduler process report their tiers under
+    last_run in /scheduler-status instead.
+    """
+    return jsonify({
+        "status": "success",
+        "tiered": CLASSIFY_TIERED,
+        "models": {"gate": CLAUDE_GATE_MODEL, "enrich": CLAUDE_MODEL},
+        "tiers": ClassificationMetrics.summarize(classification_metrics.snapshot()),
+    })
+
+
+@app.route("/scheduler-status")
+def scheduler_status_endpoint():
+    state = scheduler_state.find_one({"_id": "ingest"}, {"_id": 0}) or ingest_schedule
+    lock = locks.find_one({"_id": "ingest"}, {"_id": 0, "owner": 1, "acquired_at": 1})
+    return jsonify({"status": "success", **state, "ingest_running": lock is not None})
+
+
+# --- CLI Commands ---
+
+@app.cli.command("migrate-published-dates")
+def migrate_published_dates():
+    """Converts string published_date values to BSON datetimes (one-off)."""
+    operations, unparseable = [], 0
+    for doc in collection.find({"published_date": {"$type": "string"}}, {"published_date": 1}):
+        parsed = parse_pub_date(doc["published_date"])
+        if parsed is None:
+            unparseable += 1
+            continue
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"published_date": parsed}}))
+        if len(operations) >= 500:
+            collection.bulk_write(operations, ordered=False)
+            click.echo(f"Migrated {len(operations)} documents...")
+            operations = []
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+    click.echo(f"Migration finished. Unparseable dates left as strings: {unparseable}")
+
+
+@app.cli.command("dedupe-articles")
+def dedupe_articles():
+    """Deletes repeated article_id documents, keeping the oldest, then builds the unique index (one-off)."""
+    pipeline = [
+        {"$match": {"article_id": {"$type": "string"}}},
+        {"$group": {"_id": "$article_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    extra_ids = []
+    for group in collection.aggregate(pipeline, allowDiskUse=True):
+        extra_ids.extend(sorted(group["ids"])[1:])
+    removed = 0
+    for i in range(0, len(extra_ids), 500):
+        removed += collection.delete_many({"_id": {"$in": extra_ids[i:i + 500]}}).deleted_count
+    click.echo(f"Removed {removed} duplicate articles.")
+    ensure_indexes()
+
+
+@app.cli.command("backfill-search-prefixes")
+def backfill_search_prefixes():
+    """Adds search_prefixes to articles stored before the indexed prefix search (one-off)."""
+    operations, updated = [], 0
+    projection = {field: 1 for field in SEARCH_PREFIX_FIELDS}
+    for doc in collection.find({"search_prefixes": {"$exists": False}}, projection):
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search_prefixes": search_prefixes(doc)}}))
+        if len(operations) >= 500:
+            collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            click.echo(f"Backfilled {updated} documents...")
+            operations = []
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+        updated += len(operations)
+    click.echo(f"Backfill finished. Documents updated: {updated}")
+
+
+@app.cli.command("backfill-title-minhash")
+def backfill_title_minhash():
+    """Adds title_shingles/title_minhash_bands to articles stored before MinHash dedup (one-off)."""
+    operations, updated = [], 0
+    for doc in collection.find({"title_minhash_bands": {"$exists": False}}, {"headline": 1}):
+        shingles = headline_shingles(doc.get("headline"))
+        operations.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {
+                "$set": {"title_shingles": sorted(shingles), "title_minhash_bands": minhash_bands(shingles)},
+                "$unset": {"title_simhash": "", "title_simhash_bands": ""},
+            },
+        ))
+        if len(operations) >= 500:
+            collection.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            click.echo(f"Backfilled {updated} documents...")
+            operations = []
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+        updated += len(operations)
+    # Superseded by the (title_minhash_bands, published_date) index.
+    for index_name in ("title_simhash_bands_1", "title_minhash_bands_1"):
+        try:
+            collection.drop_index(index_name)
+        except PyMongoError:
+            pass
+    click.echo(f"Backfill finished. Documents updated: {updated}")
+
+
+def start_scheduler():
+    """Starts adaptive ingest polling; the first run happens right away."""
     scheduler.start()
+    schedule_next_ingest(0)
+    atexit.register(lambda: scheduler.shutdown(wait=False))
 
-    # # Initial run on startup
-    with app.app_context():
-        fetch_news_job()
 
-    # # Shut down the scheduler when exiting the app
-    atexit.register(lambda: scheduler.shutdown())
-    app.run(debug=False, use_reloader=False)
+def create_app(run_scheduler=False):
+    """Prepares the app for serving. Only one process should pass run_scheduler=True."""
+    ensure_indexes()
+    if run_scheduler:
+        start_scheduler()
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily governance news backend")
+    parser.add_argument(
+        "--scheduler-only",
+        action="store_true",
+        help="Run only the ingest scheduler (used alongside gunicorn, see gunicorn.conf.py).",
+    )
+    args = parser.parse_args()
+
+    create_app(run_scheduler=True)
+    if args.scheduler_only:
+        threading.Event().wait()
+    else:
+        app.run(debug=False, use_reloader=False)
     # app.run(debug=True)
 
 # To run this application in a production environment using IIS (Internet Information Services),
@@ -682,7 +2962,9 @@ if __name__ == "__main__":
 # 1. Ensure IIS has the CGI module enabled.
 # 2. Install wfastcgi: pip install wfastcgi
 # 3. Configure IIS to use your Python installation by running: wfastcgi-enable
-# 4. Create a web.config file in this directory to point IIS to your Flask app.
+# 4. Create a web.config file in this directory to point IIS to your Flask app
+#    (WSGI_HANDLER=wsgi.app), and run `python main.py --scheduler-only` once as a
+#    separate service so the scheduler is not started inside every IIS worker.
 #
 # You will also need to set the following environment variables in your IIS application settings:
 # - FLASK_ENV=production
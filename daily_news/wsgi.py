@@ -0,0 +1,8 @@
+"""WSGI entry point for production servers (gunicorn, waitress, wfastcgi).
+
+Web workers never start the ingest scheduler; it runs in its own process
+(`python main.py --scheduler-only`), which gunicorn.conf.py starts for you.
+"""
+from main import create_app
+
+app = create_app()
@@ -18,6 +18,9 @@ function NewsFileViewer() {
   const [modalContent, setModalContent] = useState("");
   const [searchQuery, setSearchQuery] = useState("");
   const [searchResults, setSearchResults] = useState([]);
+  // Server-side paging of /search-articles (see has_more/match in its response).
+  const [searchPage, setSearchPage] = useState({ page: 1, hasMore: false, match: null });
+  const [loadingMoreResults, setLoadingMoreResults] = useState(false);
   // const [isSearching, setIsSearching] = useState(false);
 
   const [currentPage, setCurrentPage] = useState(1);
@@ -37,17 +40,26 @@ function NewsFileViewer() {
   //   navigate("/search");
   // };
 
+  const fetchSearchResults = async (page, match) => {
+    const params = new URLSearchParams({ keyword: searchQuery.trim(), page: String(page) });
+    if (match) {
+      params.set("match", match);
+    }
+    const res = await fetch(`${BASE_URL}/search-articles?${params}`);
+    return res.json();
+  };
+
   useEffect(() => {
     const delay = setTimeout(async () => {
       if (searchQuery.trim().length > 1) {
         try {
-          const res = await fetch(`${BASE_URL}/search-articles?keyword=${encodeURIComponent(searchQuery.trim())}`);
-          const data = await res.json();
+          const data = await fetchSearchResults(1, null);
 
           if (data.status === "success") {
             setSearchResults(data.articles || []);
+            setSearchPage({ page: 1, hasMore: data.has_more, match: data.match });
             setCurrentPage(1);
-            toast.success(`${data.articles.length} articles found`);
+            toast.success(`${data.articles.length}${data.has_more ? "+" : ""} articles found`);
           } else {
             toast.error(data.message || "Search failed.");
           }
@@ -63,6 +75,25 @@ function NewsFileViewer() {
     return () => clearTimeout(delay);
   }, [searchQuery, BASE_URL]);
 
+  const loadMoreSearchResults = async () => {
+    setLoadingMoreResults(true);
+    try {
+      const nextPage = searchPage.page + 1;
+      const data = await fetchSearchResults(nextPage, searchPage.match);
+      if (data.status === "success") {
+        setSearchResults((prev) => [...prev, ...(data.articles || [])]);
+        setSearchPage({ page: nextPage, hasMore: data.has_more, match: data.match });
+      } else {
+        toast.error(data.message || "Search failed.");
+      }
+    } catch (err) {
+      toast.error("Error fetching search results.");
+      console.error(err);
+    } finally {
+      setLoadingMoreResults(false);
+    }
+  };
+
 
   const fetchNewsFile = async () => {
     setLoading(true);
@@ -139,12 +170,68 @@ function NewsFileViewer() {
   };
 
   useEffect(() => {
-    fetchNewsFile();
+    // Live updates: the server pushes each newly stored article. The list is
+    // loaded once the stream is open so nothing stored in between is missed;
+    // EventSource reconnects on its own and resumes from the last event id.
+    // While the stream is down (e.g. blocked by a proxy) the list falls back
+    // to a slow poll, and cards older than 24h are pruned either way.
+    const DAY_MS = 24 * 60 * 60 * 1000;
+    const FALLBACK_REFRESH_MS = 10 * 60 * 1000;
+    const PRUNE_INTERVAL_MS = 5 * 60 * 1000;
+
+    // published_date is "YYYY-MM-DD HH:MM:SS" in UTC.
+    const isRecent = (article) => {
+      const published = Date.parse(`${(article.published_date || "").replace(" ", "T")}Z`);
+      return !Number.isNaN(published) && Date.now() - published <= DAY_MS;
+    };
+
+    let loaded = false;
+    const loadOnce = () => {
+      if (!loaded) {
+        loaded = true;
+        fetchNewsFile();
+      }
+    };
 
-    // Auto-refresh every 10 minutes
-    const interval = setInterval(fetchNewsFile, 10 * 60 * 1000);
+    let fallbackPoll = null;
+    const stopFallbackPoll = () => {
+      if (fallbackPoll) {
+        clearInterval(fallbackPoll);
+        fallbackPoll = null;
+      }
+    };
+
+    const source = new EventSource(`${BASE_URL}/live-articles`);
+    source.addEventListener("ready", () => {
+      stopFallbackPoll();
+      loadOnce();
+    });
+    source.addEventListener("article", (event) => {
+      const article = JSON.parse(event.data);
+      if (!isRecent(article)) {
+        return;
+      }
+      setNewsCards((prev) =>
+        prev.some((a) => a.article_id === article.article_id) ? prev : [article, ...prev]
+      );
+      setError("");
+    });
+    source.onerror = () => {
+      loadOnce();
+      if (!fallbackPoll) {
+        fallbackPoll = setInterval(fetchNewsFile, FALLBACK_REFRESH_MS);
+      }
+    };
 
-    return () => clearInterval(interval);
+    const prune = setInterval(() => {
+      setNewsCards((prev) => (prev.every(isRecent) ? prev : prev.filter(isRecent)));
+    }, PRUNE_INTERVAL_MS);
+
+    return () => {
+      source.close();
+      stopFallbackPoll();
+      clearInterval(prune);
+    };
   }, [BASE_URL]);
 
   useEffect(() => {
@@ -273,7 +360,7 @@ function NewsFileViewer() {
             <div>
               <h1 className="todays-news-title">
                 {searchResults.length > 0
-                  ? `Search Results (${searchResults.length} Articles)`
+                  ? `Search Results (${searchResults.length}${searchPage.hasMore ? "+" : ""} Articles)`
                   : `Today's News (${newsCards.length} Articles)`}
               </h1>
             </div>
@@ -407,6 +494,18 @@ function NewsFileViewer() {
                   </button>
                 </div>
               )}
+
+              {searchResults.length > 0 && searchPage.hasMore && (
+                <div className="pagination">
+                  <button
+                    className="pagination-btn"
+                    onClick={loadMoreSearchResults}
+                    disabled={loadingMoreResults}
+                  >
+                    {loadingMoreResults ? "Loading..." : "Load more results"}
+                  </button>
+                </div>
+              )}
             </>
           ) : (
             <div className="empty-state">
@@ -10,20 +10,33 @@ const Search = () => {
   const [articles, setArticles] = useState([]);
   const [currentPage, setCurrentPage] = useState(1);
   const articlesPerPage = 9;
+  // Server-side paging of /search-articles: last page fetched, whether more
+  // remain, and the match mode ("text" or "prefix") to keep for later pages.
+  const [resultsPage, setResultsPage] = useState({ page: 1, hasMore: false, match: null });
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const fetchResults = async (page, match) => {
+    const params = new URLSearchParams({ keyword: query.trim(), page: String(page) });
+    if (match) {
+      params.set("match", match);
+    }
+    const res = await fetch(`${import.meta.env.VITE_BASE_URL}/search-articles?${params}`);
+    return res.json();
+  };
 
   useEffect(() => {
     const delay = setTimeout(async () => {
       if (query.trim().length > 1) {
         try {
-          const res = await fetch(`${import.meta.env.VITE_BASE_URL}/search-articles?keyword=${encodeURIComponent(query.trim())}`);
-          const data = await res.json();
+          const data = await fetchResults(1, null);
 
           if (data.status === "success") {
             setArticles(data.articles || []);
+            setResultsPage({ page: 1, hasMore: data.has_more, match: data.match });
             setCurrentPage(1);
 
             if (data.articles.length > 0) {
-              toast.success(`${data.articles.length} articles found`);
+              toast.success(`${data.articles.length}${data.has_more ? "+" : ""} articles found`);
             } else {
               toast.error("No matching articles.");
             }
@@ -40,6 +53,25 @@ const Search = () => {
     return () => clearTimeout(delay);
   }, [query]);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const nextPage = resultsPage.page + 1;
+      const data = await fetchResults(nextPage, resultsPage.match);
+      if (data.status === "success") {
+        setArticles((prev) => [...prev, ...(data.articles || [])]);
+        setResultsPage({ page: nextPage, hasMore: data.has_more, match: data.match });
+      } else {
+        toast.error(data.message || "Search failed.");
+      }
+    } catch (err) {
+      toast.error("Error fetching search results.");
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
 
   const totalPages = Math.ceil(articles.length / articlesPerPage);
   const paginatedArticles = articles.slice(
@@ -77,7 +109,7 @@ const Search = () => {
 
       {articles.length > 0 && (
         <p style={{ textAlign: "center", fontWeight: 500, "padding-bottom":"20px" }}>
-          {articles.length} articles found for "{query}"
+          {articles.length}{resultsPage.hasMore ? "+" : ""} articles found for "{query}"
         </p>
       )}
 
@@ -134,6 +166,14 @@ const Search = () => {
           ))}
         </div>
       )}
+
+      {resultsPage.hasMore && (
+        <div className="pagination">
+          <button className="page-btn" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 };